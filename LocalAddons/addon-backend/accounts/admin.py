@@ -1,8 +1,14 @@
 from django.contrib import admin
 
-from .models import User
+from .models import RevokedToken, User
 
 
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
     search_fields = ("username", "email", "mobile")
+
+
+@admin.register(RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    list_display = ("jti", "user", "expires_at", "created_at")
+    search_fields = ("jti", "user__email")
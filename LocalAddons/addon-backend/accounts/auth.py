@@ -1,18 +1,44 @@
-from datetime import datetime, timezone
+import hashlib
+import time
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from rest_framework import HTTP_HEADER_ENCODING, authentication
 from rest_framework.request import Request
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
 from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import Token
 
-from .models import User
+from backend.utils import TTLCache
+
+from .models import CIMAGE_EMAIL_DOMAIN, User
+from .revocation import revocation_list
+from .services import AuthService
+from .tracking import last_seen_tracker
+
+# Validated access tokens keyed by a digest of the raw token, each kept until
+# the token itself expires, so repeat calls skip parsing and HMAC verification
+token_cache = TTLCache(settings.TOKEN_CACHE_SIZE, ttl=0)
 
 
 class CustomJWTAuthentication(JWTAuthentication):
+    def get_validated_token(self, raw_token):
+        cache_key = hashlib.sha256(raw_token).hexdigest()
+        validated_token = token_cache.get(cache_key)
+        if validated_token is None:
+            validated_token = super().get_validated_token(raw_token)
+            expires_in = validated_token.get("exp", 0) - time.time()
+            if expires_in > 0:
+                token_cache.set(cache_key, validated_token, ttl=expires_in)
+
+        if revocation_list.is_revoked(validated_token.get(api_settings.JTI_CLAIM)):
+            raise InvalidToken(_("Token has been revoked"), code="token_revoked")
+        return validated_token
+
     def get_user(self, validated_token):
         try:
             user_id = validated_token[api_settings.USER_ID_CLAIM]
@@ -21,22 +47,14 @@ class CustomJWTAuthentication(JWTAuthentication):
                 _("Token contained no recognizable user identification")
             ) from e
 
-        try:
-            user = User.objects.get(
-                **{
-                    api_settings.USER_ID_FIELD: user_id,
-                    "is_active": True,
-                    "is_deleted": False,
-                }
-            )
-            user.last_login = datetime.now(timezone.utc)
-            user.save(update_fields=["last_login"])
-        except User.DoesNotExist:
+        user = AuthService.get_active_user(user_id)
+        if user is None:
             raise AuthenticationFailed(_("User not found"), code="user_not_found")
 
         if not user.is_active:
             raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
 
+        last_seen_tracker.touch(user.pk)
         return user
 
 
@@ -46,3 +64,49 @@ class OptionalJWTAuthentication(CustomJWTAuthentication):
             return super().authenticate(request)
         except (InvalidToken, AuthenticationFailed):
             return None
+
+
+class ClaimsUser(TokenUser):
+    """
+    Request user backed by the claims embedded by ``get_tokens_for_user``.
+    Attributes that are not carried in the token are loaded from the ``User``
+    row on first access.
+    """
+
+    @cached_property
+    def email(self) -> str:
+        return self.token.get("email", "")
+
+    @cached_property
+    def user_type(self) -> str:
+        return self.token.get("user_type", "")
+
+    @property
+    def is_cimage_student(self) -> bool:
+        return self.email.endswith(f"@{CIMAGE_EMAIL_DOMAIN}")
+
+    @cached_property
+    def db_user(self) -> User:
+        user = AuthService.get_active_user(self.id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        return user
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.db_user, attr)
+
+
+class OptionalClaimsJWTAuthentication(OptionalJWTAuthentication):
+    """
+    Optional authentication for read-mostly views that only need the caller's
+    identity. Returns a ``ClaimsUser`` instead of querying the ``User`` table.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        user = ClaimsUser(validated_token)
+        last_seen_tracker.touch(user.pk)
+        return user
@@ -1,35 +1,103 @@
+import hashlib
 from typing import Any, Dict
 
 import requests as rq
+from asgiref.sync import sync_to_async
+from requests.adapters import HTTPAdapter
 
-from backend.config import GOOGLE_RECAPTCHA_SECRET_KEY, HCAPTCHA_SECRET_KEY
+from backend.config import (
+    CAPTCHA_CACHE_TTL,
+    CAPTCHA_POOL_SIZE,
+    CAPTCHA_STUB,
+    CAPTCHA_TIMEOUT,
+    GOOGLE_RECAPTCHA_SECRET_KEY,
+    HCAPTCHA_SECRET_KEY,
+)
+from backend.utils import TTLCache
+
+HCAPTCHA_VERIFY_URL = "https://hcaptcha.com/siteverify"
+GOOGLE_RECAPTCHA_VERIFY_URL = "https://www.google.com/recaptcha/api/siteverify"
+
+# Token the stub provider rejects, so load tests can exercise the failure path
+STUB_FAILING_TOKEN = "stub-fail"
+
+# One keep-alive session per worker so verifications reuse TLS connections
+session = rq.Session()
+session.mount("https://", HTTPAdapter(pool_maxsize=CAPTCHA_POOL_SIZE))
+
+# Tokens that already passed, keyed with the client that presented them, so the
+# same client retrying a signup is not rejected by the provider as a duplicate.
+# Callers consume the entry once the guarded action succeeds, so a token
+# cannot be replayed.
+verified_tokens = TTLCache(maxsize=10_000, ttl=CAPTCHA_CACHE_TTL)
 
 
 class Captcha:
     @staticmethod
-    def verify_hcaptcha(captcha_user_token: str) -> bool:
-        captcha_res: Dict[str, Any] = rq.post(
-            "https://hcaptcha.com/siteverify",
-            data={
-                "secret": HCAPTCHA_SECRET_KEY,
-                "response": captcha_user_token,
-            },
-        ).json()
-        is_success = captcha_res.get("success", False)
-        if not is_success:
-            raise ValueError("Captcha verification failed")
-        return is_success
+    def verify_hcaptcha(captcha_user_token: str, client_id: str) -> bool:
+        return Captcha._verify(
+            HCAPTCHA_VERIFY_URL,
+            HCAPTCHA_SECRET_KEY,
+            captcha_user_token,
+            client_id,
+            "Captcha verification failed",
+        )
+
+    @staticmethod
+    def verify_google_recaptcha(captcha_user_token: str, client_id: str) -> bool:
+        return Captcha._verify(
+            GOOGLE_RECAPTCHA_VERIFY_URL,
+            GOOGLE_RECAPTCHA_SECRET_KEY,
+            captcha_user_token,
+            client_id,
+            "Google reCAPTCHA verification failed",
+        )
+
+    @staticmethod
+    async def averify_hcaptcha(captcha_user_token: str, client_id: str) -> bool:
+        return await sync_to_async(Captcha.verify_hcaptcha, thread_sensitive=False)(
+            captcha_user_token, client_id
+        )
+
+    @staticmethod
+    async def averify_google_recaptcha(captcha_user_token: str, client_id: str) -> bool:
+        return await sync_to_async(
+            Captcha.verify_google_recaptcha, thread_sensitive=False
+        )(captcha_user_token, client_id)
+
+    @staticmethod
+    def consume(captcha_user_token: str, client_id: str) -> None:
+        """Forget a verified token once the action it guarded has succeeded."""
+        verified_tokens.delete(Captcha._cache_key(captcha_user_token, client_id))
 
     @staticmethod
-    def verify_google_recaptcha(captcha_user_token: str) -> bool:
-        captcha_res = rq.post(
-            "https://www.google.com/recaptcha/api/siteverify",
-            data={
-                "secret": GOOGLE_RECAPTCHA_SECRET_KEY,
-                "response": captcha_user_token,
-            },
-        ).json()
-        is_success = captcha_res.get("success", False)
+    def _cache_key(captcha_user_token: str, client_id: str) -> str:
+        return hashlib.sha256(f"{client_id}|{captcha_user_token}".encode()).hexdigest()
+
+    @staticmethod
+    def _verify(
+        url: str, secret: str, captcha_user_token: str, client_id: str, error: str
+    ) -> bool:
+        cache_key = Captcha._cache_key(captcha_user_token, client_id)
+        if verified_tokens.get(cache_key):
+            return True
+
+        if CAPTCHA_STUB:
+            is_success = bool(captcha_user_token) and (
+                captcha_user_token != STUB_FAILING_TOKEN
+            )
+        else:
+            try:
+                captcha_res: Dict[str, Any] = session.post(
+                    url,
+                    data={"secret": secret, "response": captcha_user_token},
+                    timeout=CAPTCHA_TIMEOUT,
+                ).json()
+            except (rq.RequestException, ValueError) as e:
+                raise ValueError(error) from e
+            is_success = captcha_res.get("success", False)
+
         if not is_success:
-            raise ValueError("Google reCAPTCHA verification failed")
+            raise ValueError(error)
+        verified_tokens.set(cache_key, True)
         return is_success
@@ -0,0 +1,85 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher,
+    check_password,
+    make_password,
+)
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the iteration count taken from PASSWORD_HASH_ITERATIONS.
+    It keeps the stock algorithm name so existing hashes still verify, and
+    Django's must_update check rehashes them on the next successful login.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many sign-in attempts right now, please retry shortly."
+    default_code = "password_hashing_busy"
+
+
+class PasswordHashingPool:
+    """
+    Per-process cap on concurrent PBKDF2 work. The request thread still
+    blocks until its hash is done. What the pool bounds is how many hashes
+    this process runs at once, ``workers``, so a login burst cannot occupy
+    every core the process's threads could reach. Each process has its own
+    pool, so size ``workers`` for the deployment: N processes hash on up to
+    N x ``workers`` cores. Once ``workers + max_pending`` calls are in flight,
+    new callers wait up to ``wait_timeout`` seconds for a slot and then fail
+    fast with ``PasswordHashingBusy`` (503).
+    """
+
+    def __init__(self, workers: int, max_pending: int, wait_timeout: float) -> None:
+        self.wait_timeout = wait_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+
+    def run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.wait_timeout):
+            raise PasswordHashingBusy()
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def check_password(self, user, raw_password: str) -> bool:
+        """
+        Verify ``raw_password`` against ``user`` off the request thread. When the
+        stored hash uses outdated parameters it is recomputed in the pool and
+        saved here, so the DB write stays on the request's own connection.
+        """
+        rehashed = []
+        is_correct = self.run(
+            check_password,
+            raw_password,
+            user.password,
+            lambda raw: rehashed.append(make_password(raw)),
+        )
+        if rehashed:
+            user.password = rehashed[0]
+            user.save(update_fields=["password"])
+        return is_correct
+
+    def make_password(self, raw_password: str) -> str:
+        return self.run(make_password, raw_password)
+
+
+hashing_pool = PasswordHashingPool(
+    settings.PASSWORD_HASH_WORKERS,
+    settings.PASSWORD_HASH_MAX_PENDING,
+    settings.PASSWORD_HASH_WAIT_TIMEOUT,
+)
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from accounts.auth import OptionalClaimsJWTAuthentication, token_cache
+from accounts.models import User
+from accounts.utils import get_tokens_for_user
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure per-request JWT authentication overhead with and without the "
+        "validated-token cache. The benchmark user is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=20_000)
+
+    def handle(self, *args, **options):
+        count = options["requests"]
+        with transaction.atomic():
+            user = User.objects.create(
+                username="bench_auth",
+                email="bench_auth@example.com",
+                mobile="0000000000",
+            )
+            token = get_tokens_for_user(user)["access_token"]
+            request = Request(
+                APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+            )
+            # Claims-only authentication keeps the DB out of the measurement
+            authenticator = OptionalClaimsJWTAuthentication()
+
+            token_cache.clear()
+            uncached = self.measure(authenticator, request, count, clear=True)
+            token_cache.clear()
+            cached = self.measure(authenticator, request, count, clear=False)
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"without token cache: {uncached:.1f}us/request")
+        self.stdout.write(f"with token cache: {cached:.1f}us/request")
+        self.stdout.write(f"token cache stats: {token_cache.stats()}")
+
+    def measure(self, authenticator, request, count, clear):
+        started = time.perf_counter()
+        for _ in range(count):
+            if clear:
+                token_cache.clear()
+            authenticator.authenticate(request)
+        return (time.perf_counter() - started) / count * 1_000_000
@@ -0,0 +1,74 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory
+
+from accounts.hashers import hashing_pool
+from accounts.services import AuthService
+from accounts.views import LoginView
+
+PASSWORD = "bench-Passw0rd!"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure LoginView throughput with the current password hasher profile. "
+        "The benchmark user is created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50)
+        parser.add_argument("--concurrency", type=int, default=os.cpu_count() or 1)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = AuthService.create_user(
+                {
+                    "username": "bench_login",
+                    "email": "bench_login@example.com",
+                    "mobile": "0000000000",
+                    "password": PASSWORD,
+                }
+            )
+            self.stdout.write(
+                f"PBKDF2 iterations: {settings.PASSWORD_HASH_ITERATIONS}, "
+                f"pool workers: {settings.PASSWORD_HASH_WORKERS}"
+            )
+            self.bench_view(options["requests"])
+            self.bench_pool(user, options["requests"], options["concurrency"])
+            transaction.set_rollback(True)
+
+    def bench_view(self, count):
+        factory = APIRequestFactory()
+        view = LoginView.as_view()
+        body = {"email": "bench_login@example.com", "password": PASSWORD}
+        started = time.perf_counter()
+        for _ in range(count):
+            response = view(factory.post("/api/v1/users/login/", body, format="json"))
+            assert response.status_code == 200, response.data
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"LoginView, sequential: {count / elapsed:.1f} req/s (one core)"
+        )
+
+    def bench_pool(self, user, count, concurrency):
+        # Hash checks only, so threads never touch the uncommitted benchmark row
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as clients:
+            results = list(
+                clients.map(
+                    lambda _: hashing_pool.check_password(user, PASSWORD),
+                    range(count),
+                )
+            )
+        elapsed = time.perf_counter() - started
+        assert all(results)
+        workers = settings.PASSWORD_HASH_WORKERS
+        self.stdout.write(
+            f"Password checks, {concurrency} concurrent callers: "
+            f"{count / elapsed:.1f}/s total, {count / elapsed / workers:.1f}/s per core"
+        )
@@ -0,0 +1,92 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from accounts.models import User
+from accounts.services import AuthService
+
+
+def legacy_get_user(email=None, mobile=None, user_id=None, username=None):
+    """The previous AuthService.get_user, kept as the baseline."""
+    filters = Q()
+    if email:
+        filters |= Q(email=email)
+    if mobile:
+        filters |= Q(mobile=mobile)
+    if user_id:
+        filters |= Q(id=user_id)
+    if username:
+        filters |= Q(username=username)
+    return User.objects.filter(filters).first()
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway set of users and compare the legacy OR lookup with "
+        "AuthService.get_user. Everything runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=300_000)
+        parser.add_argument("--lookups", type=int, default=2_000)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(options["users"], options["batch_size"])
+            identifiers = list(
+                User.objects.filter(username__startswith="bench_").values_list(
+                    "email", "mobile"
+                )
+            )
+            sample = random.choices(identifiers, k=options["lookups"])
+
+            for label, kwargs in (
+                ("email", lambda email, mobile: {"email": email}),
+                (
+                    "email+mobile",
+                    lambda email, mobile: {"email": email, "mobile": mobile},
+                ),
+            ):
+                before = self.measure(legacy_get_user, sample, kwargs)
+                after = self.measure(AuthService.get_user, sample, kwargs)
+                self.report(f"{label} before (OR + first)", before)
+                self.report(f"{label} after (indexed probes)", after)
+            transaction.set_rollback(True)
+
+    def seed(self, count, batch_size):
+        started = time.perf_counter()
+        for start in range(0, count, batch_size):
+            User.objects.bulk_create(
+                User(
+                    username=f"bench_{i}",
+                    email=f"bench_{i}@example.com",
+                    mobile=f"{i:010d}",
+                    password="!",
+                )
+                for i in range(start, min(start + batch_size, count))
+            )
+        self.stdout.write(
+            f"Seeded {count} users in {time.perf_counter() - started:.1f}s"
+        )
+
+    def measure(self, lookup, sample, kwargs):
+        timings = []
+        for email, mobile in sample:
+            lookup_kwargs = kwargs(email, mobile)
+            started = time.perf_counter()
+            lookup(**lookup_kwargs)
+            timings.append((time.perf_counter() - started) * 1_000_000)
+        return timings
+
+    def report(self, label, timings):
+        timings.sort()
+        self.stdout.write(
+            f"{label}: mean {statistics.mean(timings):.0f}us, "
+            f"p50 {timings[len(timings) // 2]:.0f}us, "
+            f"p95 {timings[int(len(timings) * 0.95)]:.0f}us"
+        )
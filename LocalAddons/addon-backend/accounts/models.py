@@ -1,6 +1,10 @@
 from django.contrib.auth.models import AbstractBaseUser
 from django.core.validators import RegexValidator
 from django.db import models
+from django.db.models.functions import Lower
+
+# Mailbox domain of campus accounts, see User.is_cimage_student
+CIMAGE_EMAIL_DOMAIN = "cimage.in"
 
 username_validator = RegexValidator(
     regex=r"^[a-zA-Z0-9_.-]+$",
@@ -9,6 +13,24 @@ username_validator = RegexValidator(
 )
 
 
+class UserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """
+        Also drop the updated users from this worker's user cache, as no
+        save signal fires for a queryset update.
+        """
+        # Written behind by LastSeenTracker, never an input to authentication
+        if set(kwargs) <= {"last_login"}:
+            return super().update(**kwargs)
+        from .services import AuthService
+
+        user_ids = list(self.values_list("pk", flat=True))
+        rows = super().update(**kwargs)
+        for user_id in user_ids:
+            AuthService.invalidate_cached_user(user_id)
+        return rows
+
+
 class User(AbstractBaseUser):
     USERNAME_FIELD = "email"
 
@@ -43,9 +65,29 @@ class User(AbstractBaseUser):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = UserQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(Lower("email"), name="user_email_lower_idx"),
+            models.Index(Lower("username"), name="user_username_lower_idx"),
+        ]
+
     def __str__(self):
         return self.email
 
     @property
     def is_cimage_student(self):
-        return self.email.endswith("@cimage.in")
+        return self.email.endswith(f"@{CIMAGE_EMAIL_DOMAIN}")
+
+
+class RevokedToken(models.Model):
+    jti = models.CharField(max_length=255, unique=True)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="revoked_tokens"
+    )
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Revoked token {self.jti} of {self.user.email}"
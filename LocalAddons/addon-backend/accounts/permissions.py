@@ -0,0 +1,12 @@
+from rest_framework import permissions
+
+from .models import User
+
+
+class IsAdminUser(permissions.BasePermission):
+    def has_permission(self, request, view):
+        return bool(
+            request.user
+            and request.user.is_authenticated
+            and request.user.user_type == User.UserType.ADMIN
+        )
@@ -0,0 +1,53 @@
+import threading
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import RevokedToken
+
+
+class RevocationList:
+    """
+    Per-worker copy of the revoked access token ids. Every ``sync_interval``
+    seconds the unexpired rows of ``RevokedToken`` are reloaded whole, which
+    picks up revocations made by other workers, so checking a token that is
+    not revoked is a dict lookup with no DB access.
+    """
+
+    def __init__(self, sync_interval: float) -> None:
+        self.sync_interval = sync_interval
+        self._expiry_by_jti: dict[str, datetime] = {}
+        self._last_sync = float("-inf")
+        self._lock = threading.Lock()
+
+    def is_revoked(self, jti: str) -> bool:
+        if time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+        return jti in self._expiry_by_jti
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        with self._lock:
+            self._expiry_by_jti[jti] = expires_at
+
+    def sync(self) -> None:
+        self._last_sync = time.monotonic()
+        now = timezone.now()
+        # A full reload rather than rows past the last seen id: ids are not
+        # committed in order, so a late commit with a lower id would be skipped
+        revoked = dict(
+            RevokedToken.objects.filter(expires_at__gt=now).values_list(
+                "jti", "expires_at"
+            )
+        )
+        with self._lock:
+            # Keep tokens revoked here whose row is not visible to this read yet.
+            # Expired tokens fail validation anyway, so stop tracking them
+            for jti, expires_at in self._expiry_by_jti.items():
+                if expires_at > now:
+                    revoked.setdefault(jti, expires_at)
+            self._expiry_by_jti = revoked
+
+
+revocation_list = RevocationList(settings.TOKEN_REVOCATION_SYNC_INTERVAL)
@@ -3,7 +3,7 @@ from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
 
 from .models import User, username_validator
-from .services import AuthService
+from .services import DUPLICATE_USER_MESSAGES, AuthService
 
 
 class RegisterInpSerializer(serializers.Serializer):
@@ -28,20 +28,15 @@ class RegisterInpSerializer(serializers.Serializer):
             attrs["email"] = attrs["email"].lower()
 
         # Check if user already exists
-        email = attrs.get("email")
-        mobile = attrs.get("mobile")
         username = attrs.get("username")
-        if email and AuthService.get_user(email=email):
-            raise serializers.ValidationError(
-                {"email": "User with this email already exists."}
-            )
-        if mobile and AuthService.get_user(mobile=mobile):
-            raise serializers.ValidationError(
-                {"mobile": "User with this mobile already exists."}
-            )
-        if username and AuthService.get_user(username=username):
+        taken = AuthService.get_taken_identifiers(
+            email=attrs.get("email"),
+            mobile=attrs.get("mobile"),
+            username=username.lower() if username else None,
+        )
+        if taken:
             raise serializers.ValidationError(
-                {"username": "User with this username already exists."}
+                {field: DUPLICATE_USER_MESSAGES[field] for field in sorted(taken)}
             )
         return attrs
 
@@ -1,6 +1,30 @@
+import copy
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.db.models import Q
+from django.db.models.functions import Lower
+from rest_framework.exceptions import ValidationError
+from rest_framework_simplejwt.settings import api_settings
+
+from backend.utils import TTLCache
+
+from .hashers import hashing_pool
+from .models import RevokedToken, User
+from .revocation import revocation_list
+
+# Per-worker cache of active users keyed by id. Entries are dropped on save,
+# delete or queryset update in this worker. Other workers only notice once the
+# entry expires, so a deactivated user can authenticate there for at most
+# USER_CACHE_TTL seconds.
+user_cache = TTLCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL)
 
-from .models import User
+DUPLICATE_USER_MESSAGES = {
+    "email": "User with this email already exists.",
+    "mobile": "User with this mobile already exists.",
+    "username": "User with this username already exists.",
+}
 
 
 class AuthService:
@@ -9,27 +33,100 @@ class AuthService:
         if not email and not mobile and not user_id and not username:
             raise ValueError("Either email, mobile, user_id or username is required")
 
+        # One probe per identifier keeps each lookup on its own index, where an
+        # OR across columns plus .first() tends to end up as a scan and a sort.
+        users = User.objects.alias(
+            email_lower=Lower("email"), username_lower=Lower("username")
+        )
+        lookups = (
+            ("email_lower", email.lower() if email else None),
+            ("mobile", mobile),
+            ("pk", user_id),
+            ("username_lower", username.lower() if username else None),
+        )
+        for field, value in lookups:
+            if value:
+                user = users.filter(**{field: value})[:1]
+                if user:
+                    return user[0]
+        return None
+
+    @staticmethod
+    def get_active_user(user_id) -> User | None:
+        """Return the active, non-deleted user with the given id, using the user cache."""
+        user = user_cache.get(user_id)
+        if user is None:
+            try:
+                user = User.objects.get(pk=user_id, is_active=True, is_deleted=False)
+            except User.DoesNotExist:
+                return None
+            user_cache.set(user_id, user)
+        # Hand out a copy so per-request mutations never leak into the cache
+        return copy.copy(user)
+
+    @staticmethod
+    def invalidate_cached_user(user_id) -> None:
+        user_cache.delete(user_id)
+
+    @staticmethod
+    def get_taken_identifiers(email=None, mobile=None, username=None) -> set[str]:
+        """Return which of email, mobile and username already belong to a user, in one query."""
+        # Email and username compare case-insensitively, as get_user looks them up
+        wanted = {
+            field: value
+            for field, value in (
+                ("email", email.lower() if email else None),
+                ("mobile", mobile),
+                ("username", username.lower() if username else None),
+            )
+            if value
+        }
+        if not wanted:
+            return set()
+
+        columns = {
+            "email": "email_lower",
+            "mobile": "mobile",
+            "username": "username_lower",
+        }
         filters = Q()
-        if email:
-            filters |= Q(email=email)
-        if mobile:
-            filters |= Q(mobile=mobile)
-        if user_id:
-            filters |= Q(id=user_id)
-        if username:
-            filters |= Q(username=username)
+        for field, value in wanted.items():
+            filters |= Q(**{columns[field]: value})
 
-        return User.objects.filter(filters).first()
+        users = User.objects.annotate(
+            email_lower=Lower("email"), username_lower=Lower("username")
+        ).filter(filters)
+        taken = set()
+        for row in users.values(*(columns[field] for field in wanted)):
+            taken.update(
+                field for field, value in wanted.items() if row[columns[field]] == value
+            )
+        return taken
 
     @staticmethod
     def create_user(validated_data):
-        """Create a new user with the provided data, ignoring fields not in User model."""
+        """
+        Create a new user with the provided data, ignoring fields not in User model.
+        The unique constraints are the source of truth, so a concurrent signup that
+        wins the race surfaces as a field error instead of a server error.
+        """
         user_fields = {f.name for f in User._meta.fields}
         filtered_data = {k: v for k, v in validated_data.items() if k in user_fields}
         filtered_data["username"] = filtered_data["username"].lower()
         user = User(**filtered_data)
-        user.set_password(validated_data["password"])
-        user.save()
+        user.password = hashing_pool.make_password(validated_data["password"])
+        try:
+            with transaction.atomic():
+                user.save()
+        except IntegrityError:
+            taken = AuthService.get_taken_identifiers(
+                email=user.email, mobile=user.mobile, username=user.username
+            )
+            if not taken:
+                raise
+            raise ValidationError(
+                {field: [DUPLICATE_USER_MESSAGES[field]] for field in sorted(taken)}
+            )
         return user
 
     @staticmethod
@@ -43,6 +140,16 @@ class AuthService:
     @staticmethod
     def change_user_password(user, new_password):
         """Change user's password."""
-        user.set_password(new_password)
+        user.password = hashing_pool.make_password(new_password)
         user.save()
         return user
+
+    @staticmethod
+    def revoke_token(user, token):
+        """Revoke an access token before it expires, e.g. on logout."""
+        jti = token[api_settings.JTI_CLAIM]
+        expires_at = datetime.fromtimestamp(token["exp"], tz=timezone.utc)
+        RevokedToken.objects.get_or_create(
+            jti=jti, defaults={"user": user, "expires_at": expires_at}
+        )
+        revocation_list.add(jti, expires_at)
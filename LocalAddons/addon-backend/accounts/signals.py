@@ -1,8 +1,9 @@
 from django.db import models
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from .models import User
+from .services import AuthService
 
 # @receiver(pre_save, sender=User)
 # def hash_user_password(sender, instance, **kwargs):
@@ -15,3 +16,12 @@ from .models import User
 #         old_password = sender.objects.get(pk=instance.pk).password
 #         if instance.password != old_password:
 #             instance.set_password(instance.password)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Drop the cached row whenever a user changes, which covers profile updates,
+    password changes, deactivation and soft deletes.
+    """
+    AuthService.invalidate_cached_user(instance.pk)
@@ -1,3 +1,420 @@
-from django.test import TestCase
+import time
+from datetime import datetime, timedelta, timezone
+from unittest import mock
 
-# Create your tests here.
+import requests as rq
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from course.models import CourseEnrollment, CourseInstructor, CourseTechnology
+from course.tests import create_course
+
+from .auth import ClaimsUser, CustomJWTAuthentication, token_cache
+from .captcha_services import STUB_FAILING_TOKEN, Captcha, verified_tokens
+from .hashers import PasswordHashingPool
+from .models import RevokedToken, User
+from .revocation import revocation_list
+from .services import AuthService, user_cache
+from .tracking import LastSeenTracker
+from .utils import get_tokens_for_user
+
+
+def create_user(index=0, **fields):
+    return User.objects.create(
+        **{
+            "username": f"user-{index}",
+            "email": f"user-{index}@example.com",
+            "mobile": f"90000000{index:02d}",
+            **fields,
+        }
+    )
+
+
+class LastSeenTrackerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [create_user(index) for index in range(2)]
+
+    def test_touches_are_coalesced_into_one_update(self):
+        tracker = LastSeenTracker(flush_interval=0)
+        seen_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        with mock.patch.object(tracker, "flush"):
+            for user in self.users:
+                tracker.touch(user.pk, seen_at)
+                tracker.touch(user.pk, seen_at + timedelta(minutes=1))
+        with self.assertNumQueries(3):
+            self.assertEqual(tracker.flush(), 2)
+        for user in self.users:
+            user.refresh_from_db()
+            self.assertEqual(user.last_login, seen_at + timedelta(minutes=1))
+
+    def test_failed_flush_keeps_the_batch_and_spares_the_caller(self):
+        tracker = LastSeenTracker(flush_interval=0)
+        seen_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        with mock.patch.object(
+            User.objects, "bulk_update", side_effect=DatabaseError
+        ), self.assertLogs("accounts.tracking", "ERROR"):
+            tracker.touch(self.users[0].pk, seen_at)
+        self.assertEqual(tracker.flush(), 1)
+        self.users[0].refresh_from_db()
+        self.assertEqual(self.users[0].last_login, seen_at)
+
+    def test_exit_flush_skips_pending_users_of_another_database(self):
+        tracker = LastSeenTracker(flush_interval=60)
+        with mock.patch("accounts.tracking.threading.Timer"):
+            tracker.touch(self.users[0].pk)
+        with mock.patch.dict(connection.settings_dict, NAME="other"):
+            with self.assertNumQueries(0):
+                tracker.flush_at_exit()
+        with self.assertNumQueries(3):
+            tracker.flush_at_exit()
+
+    def test_idle_worker_schedules_one_flush(self):
+        tracker = LastSeenTracker(flush_interval=60)
+        with mock.patch("accounts.tracking.threading.Timer") as timer:
+            tracker.touch(self.users[0].pk)
+            tracker.touch(self.users[1].pk)
+        timer.assert_called_once_with(60, tracker._flush_idle)
+        timer.return_value.start.assert_called_once_with()
+
+
+class ClaimsAuthenticationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(bio="Bio")
+        instructor = CourseInstructor.objects.create(name="Instructor")
+        technology = CourseTechnology.objects.create(
+            slug="python", name="Python", sector="IT"
+        )
+        cls.course = create_course(0, instructor, technology)
+        CourseEnrollment.objects.create(course=cls.course, user=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.token = get_tokens_for_user(self.user)["access_token"]
+
+    def test_catalogue_serves_is_enrolled_from_claims_alone(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(f"/api/v1/courses/{self.course.slug}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["is_enrolled"])
+        # Reviewers are joined into the payload, the caller is never looked up
+        self.assertFalse(
+            [query for query in queries if 'FROM "accounts_user"' in query["sql"]]
+        )
+
+    def test_attribute_outside_the_claims_loads_the_user_once(self):
+        user = ClaimsUser(AccessToken(self.token))
+        with self.assertNumQueries(0):
+            self.assertEqual(user.email, self.user.email)
+            self.assertFalse(user.is_cimage_student)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.bio, "Bio")
+            self.assertEqual(user.mobile, self.user.mobile)
+
+
+class UserCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+        cls.admin = create_user(1, user_type=User.UserType.ADMIN)
+
+    def setUp(self):
+        user_cache.clear()
+        token_cache.clear()
+        self.client = APIClient()
+
+    def authenticate(self, user):
+        token = get_tokens_for_user(user)["access_token"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_cached_user_is_served_without_a_query(self):
+        AuthService.get_active_user(self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(AuthService.get_active_user(self.user.pk), self.user)
+
+    def test_queryset_deactivation_evicts_the_cached_user(self):
+        self.authenticate(self.user)
+        self.assertEqual(self.client.get("/api/v1/users/@me/").status_code, 200)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.client.get("/api/v1/users/@me/").status_code, 401)
+
+    def test_stats_are_exposed_to_admins_only(self):
+        self.authenticate(self.user)
+        self.assertEqual(self.client.get("/api/v1/users/cache-stats/").status_code, 403)
+        self.authenticate(self.admin)
+        response = self.client.get("/api/v1/users/cache-stats/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            set(response.data["user_cache"]), {"size", "hits", "misses", "hit_rate"}
+        )
+        self.assertEqual(response.data["user_cache"]["size"], 2)
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class SignupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
+    def signup(self, **fields):
+        data = {
+            "username": "newcomer",
+            "email": "newcomer@example.com",
+            "mobile": "9111111111",
+            "password": "Str0ng-passphrase!",
+            "cnf_password": "Str0ng-passphrase!",
+            **fields,
+        }
+        return APIClient().post("/api/v1/users/register/", data, format="json")
+
+    def test_taken_identifiers_are_found_in_one_query(self):
+        with self.assertNumQueries(1):
+            taken = AuthService.get_taken_identifiers(
+                email=self.user.email, mobile=self.user.mobile, username="free"
+            )
+        self.assertEqual(taken, {"email", "mobile"})
+
+    def test_taken_identifiers_ignore_case(self):
+        create_user(1, username="Legacy", email="Legacy@Example.com")
+        taken = AuthService.get_taken_identifiers(
+            email="legacy@example.com", username="LEGACY"
+        )
+        self.assertEqual(taken, {"email", "username"})
+
+    def test_duplicate_email_is_rejected(self):
+        response = self.signup(email=self.user.email.upper())
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {"email"})
+
+    def test_duplicate_mobile_is_rejected(self):
+        response = self.signup(mobile=self.user.mobile)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {"mobile"})
+
+    def test_signup_losing_the_race_gets_a_field_error(self):
+        # Validation passed before the other signup committed this username
+        with self.assertRaises(ValidationError) as raised:
+            AuthService.create_user(
+                {
+                    "username": self.user.username.upper(),
+                    "email": "late@example.com",
+                    "mobile": "9222222222",
+                    "password": "Str0ng-passphrase!",
+                }
+            )
+        self.assertEqual(set(raised.exception.detail), {"username"})
+        self.assertEqual(User.objects.count(), 1)
+
+
+class UserLookupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(email="Mixed.Case@Example.com", username="MixedCase")
+        create_user(1)
+
+    def test_email_lookup_ignores_case(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                AuthService.get_user(email="mixed.case@example.COM"), self.user
+            )
+
+    def test_mobile_pk_and_username_lookups(self):
+        self.assertEqual(AuthService.get_user(mobile=self.user.mobile), self.user)
+        self.assertEqual(AuthService.get_user(user_id=self.user.pk), self.user)
+        self.assertEqual(AuthService.get_user(username="mixedcase"), self.user)
+
+    def test_each_identifier_is_probed_until_one_matches(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(
+                AuthService.get_user(
+                    email="missing@example.com", mobile=self.user.mobile
+                ),
+                self.user,
+            )
+
+    def test_unknown_user_is_none(self):
+        self.assertIsNone(AuthService.get_user(email="missing@example.com"))
+        self.assertIsNone(AuthService.get_user(mobile="0000000000"))
+        with self.assertRaises(ValueError):
+            AuthService.get_user()
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class PasswordHashingTests(TestCase):
+    PASSWORD = "Str0ng-passphrase!"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(password=make_password(cls.PASSWORD))
+
+    def login(self):
+        return APIClient().post(
+            "/api/v1/users/login/",
+            {"email": self.user.email, "password": self.PASSWORD},
+            format="json",
+        )
+
+    def test_login_rehashes_outdated_iterations(self):
+        with override_settings(PASSWORD_HASH_ITERATIONS=2000):
+            self.assertEqual(self.login().status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password.split("$")[1], "2000")
+
+    def test_saturated_pool_answers_503(self):
+        pool = PasswordHashingPool(workers=1, max_pending=0, wait_timeout=0.01)
+        pool._slots.acquire()
+        with mock.patch("accounts.views.hashing_pool", pool):
+            response = self.login()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.data["detail"].code, "password_hashing_busy")
+
+
+class CaptchaTests(SimpleTestCase):
+    def setUp(self):
+        verified_tokens.clear()
+        patcher = mock.patch("accounts.captcha_services.session.post")
+        self.post = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.post.return_value.json.return_value = {"success": True}
+
+    @mock.patch("accounts.captcha_services.CAPTCHA_STUB", True)
+    def test_stub_accepts_any_token_but_the_failing_one(self):
+        self.assertTrue(Captcha.verify_hcaptcha("token", "a@example.com"))
+        with self.assertRaises(ValueError):
+            Captcha.verify_hcaptcha(STUB_FAILING_TOKEN, "a@example.com")
+        self.post.assert_not_called()
+
+    def test_verified_token_is_cached_per_client_until_consumed(self):
+        self.assertTrue(Captcha.verify_hcaptcha("token", "a@example.com"))
+        self.assertTrue(Captcha.verify_hcaptcha("token", "a@example.com"))
+        self.assertEqual(self.post.call_count, 1)
+
+        # Another client replaying the token goes back to the provider
+        self.post.return_value.json.return_value = {"success": False}
+        with self.assertRaises(ValueError):
+            Captcha.verify_hcaptcha("token", "b@example.com")
+
+        Captcha.consume("token", "a@example.com")
+        with self.assertRaises(ValueError):
+            Captcha.verify_hcaptcha("token", "a@example.com")
+        self.assertEqual(self.post.call_count, 3)
+
+    def test_provider_timeout_fails_closed(self):
+        self.post.side_effect = rq.Timeout
+        with self.assertRaises(ValueError):
+            Captcha.verify_google_recaptcha("token", "a@example.com")
+        self.post.side_effect = None
+        self.assertTrue(Captcha.verify_google_recaptcha("token", "a@example.com"))
+        self.assertEqual(self.post.call_count, 2)
+
+
+class TokenCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
+    def setUp(self):
+        token_cache.clear()
+        self.authentication = CustomJWTAuthentication()
+
+    def issue(self, lifetime=timedelta(minutes=5)):
+        token = AccessToken.for_user(self.user)
+        token.set_exp(lifetime=lifetime)
+        return token, str(token).encode()
+
+    def test_cached_token_is_not_verified_again(self):
+        _, raw = self.issue()
+        with mock.patch.object(
+            JWTAuthentication,
+            "get_validated_token",
+            autospec=True,
+            side_effect=JWTAuthentication.get_validated_token,
+        ) as verify:
+            first = self.authentication.get_validated_token(raw)
+            second = self.authentication.get_validated_token(raw)
+        self.assertEqual(verify.call_count, 1)
+        self.assertIs(first, second)
+
+    def test_expired_token_is_evicted_and_rejected(self):
+        _, raw = self.issue(lifetime=timedelta(seconds=30))
+        self.authentication.get_validated_token(raw)
+        later = datetime.now(timezone.utc) + timedelta(minutes=1)
+        with mock.patch(
+            "backend.utils.time.monotonic", return_value=time.monotonic() + 60
+        ), mock.patch(
+            "rest_framework_simplejwt.tokens.aware_utcnow", return_value=later
+        ):
+            with self.assertRaises(InvalidToken):
+                self.authentication.get_validated_token(raw)
+        self.assertEqual(token_cache.stats()["size"], 0)
+
+    def test_revoked_token_is_rejected_while_cached(self):
+        token, raw = self.issue()
+        self.authentication.get_validated_token(raw)
+        revocation_list.add(
+            token["jti"], datetime.now(timezone.utc) + timedelta(minutes=5)
+        )
+        with self.assertRaises(InvalidToken):
+            self.authentication.get_validated_token(raw)
+        self.assertEqual(token_cache.stats()["size"], 1)
+
+
+class RevocationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
+    def setUp(self):
+        user_cache.clear()
+        token_cache.clear()
+
+    def client_for(self, token):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+
+    def test_logged_out_token_is_rejected_and_others_stay_valid(self):
+        revoked = self.client_for(get_tokens_for_user(self.user)["access_token"])
+        other = self.client_for(get_tokens_for_user(self.user)["access_token"])
+        self.assertEqual(revoked.get("/api/v1/users/@me/").status_code, 200)
+        self.assertEqual(revoked.post("/api/v1/users/logout/").status_code, 200)
+        self.assertEqual(revoked.get("/api/v1/users/@me/").status_code, 401)
+        self.assertEqual(other.get("/api/v1/users/@me/").status_code, 200)
+
+    def test_revocation_from_another_worker_is_seen_after_sync(self):
+        token = AccessToken.for_user(self.user)
+        authentication = CustomJWTAuthentication()
+        revocation_list.sync()
+        authentication.get_validated_token(str(token).encode())
+        RevokedToken.objects.create(
+            jti=token["jti"],
+            user=self.user,
+            expires_at=datetime.fromtimestamp(token["exp"], tz=timezone.utc),
+        )
+        revocation_list.sync()
+        with self.assertRaises(InvalidToken):
+            authentication.get_validated_token(str(token).encode())
+
+    def test_row_committed_out_of_id_order_is_not_skipped(self):
+        expires_at = datetime.now(timezone.utc) + timedelta(minutes=5)
+        RevokedToken.objects.create(
+            id=20, jti="later", user=self.user, expires_at=expires_at
+        )
+        revocation_list.sync()
+        RevokedToken.objects.create(
+            id=10, jti="earlier", user=self.user, expires_at=expires_at
+        )
+        revocation_list.sync()
+        self.assertTrue(revocation_list.is_revoked("later"))
+        self.assertTrue(revocation_list.is_revoked("earlier"))
@@ -0,0 +1,85 @@
+import atexit
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+
+class LastSeenTracker:
+    """
+    Write-behind tracker for ``User.last_login``.
+
+    Timestamps are kept in memory, coalesced per user and written in a single
+    bulk UPDATE once ``flush_interval`` seconds have passed since the previous
+    flush, by the next ``touch`` or by a timer when the worker goes idle. An
+    interval of ``0`` writes on every call. A failed write is logged and the
+    batch kept for the next flush, and whatever is pending is flushed at exit.
+    """
+
+    def __init__(self, flush_interval: float) -> None:
+        self.flush_interval = flush_interval
+        self._pending: dict[int, datetime] = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._timer: threading.Timer | None = None
+        # Database the pending users were read from
+        self._database = None
+
+    def touch(self, user_id: int, seen_at: datetime | None = None) -> None:
+        seen_at = seen_at or datetime.now(timezone.utc)
+        with self._lock:
+            if not self._pending:
+                self._database = connection.settings_dict["NAME"]
+            self._pending[user_id] = seen_at
+            is_due = time.monotonic() - self._last_flush >= self.flush_interval
+            if not is_due and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._flush_idle)
+                self._timer.daemon = True
+                self._timer.start()
+        if is_due:
+            self.flush()
+
+    def _flush_idle(self) -> None:
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        finally:
+            # The timer thread owns this connection, nothing else will close it
+            connection.close()
+
+    def flush_at_exit(self) -> None:
+        # A test run has swapped the database back by now, keep its users out
+        if self._database == connection.settings_dict["NAME"]:
+            self.flush()
+
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+        users = [User(pk=pk, last_login=seen_at) for pk, seen_at in pending.items()]
+        try:
+            # A savepoint, so a failure never breaks the caller's transaction
+            with transaction.atomic():
+                User.objects.bulk_update(users, ["last_login"], batch_size=500)
+        except DatabaseError:
+            logger.exception("Could not write %d last-seen timestamps", len(users))
+            with self._lock:
+                for pk, seen_at in pending.items():
+                    # A newer touch that arrived meanwhile wins
+                    self._pending.setdefault(pk, seen_at)
+            return 0
+        return len(users)
+
+
+last_seen_tracker = LastSeenTracker(settings.LAST_SEEN_FLUSH_INTERVAL)
+atexit.register(last_seen_tracker.flush_at_exit)
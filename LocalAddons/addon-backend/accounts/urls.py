@@ -1,10 +1,19 @@
 from django.urls import path
 
-from .views import ChangePasswordView, LoginView, RegisterView, UserProfileView
+from .views import (
+    CacheStatsView,
+    ChangePasswordView,
+    LoginView,
+    LogoutView,
+    RegisterView,
+    UserProfileView,
+)
 
 urlpatterns = [
     path("register/", RegisterView.as_view(), name="register"),
     path("login/", LoginView.as_view(), name="login"),
+    path("logout/", LogoutView.as_view(), name="logout"),
     path("@me/", UserProfileView.as_view(), name="profile"),
     path("@me/change-password/", ChangePasswordView.as_view(), name="change-password"),
+    path("cache-stats/", CacheStatsView.as_view(), name="cache-stats"),
 ]
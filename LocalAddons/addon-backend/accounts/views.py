@@ -1,9 +1,13 @@
+import os
+
 from rest_framework import permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .captcha_services import Captcha
+from .auth import token_cache
+from .hashers import hashing_pool
+from .permissions import IsAdminUser
 from .serializers import (
     ChangePasswordSerializer,
     LoginInpSerializer,
@@ -11,7 +15,7 @@ from .serializers import (
     UserDetailSerializer,
     UserUpdateSerializer,
 )
-from .services import AuthService
+from .services import AuthService, user_cache
 from .utils import get_tokens_for_user
 
 
@@ -22,7 +26,12 @@ class RegisterView(APIView):
     def post(self, request):
         serializer = RegisterInpSerializer(data=request.data)
         if serializer.is_valid():
-            # Captcha.verify_google_recaptcha(request.data.get("captcha_token", ""))
+            # Verification is off, turning it on also means Captcha.consume()
+            # of the token once the user is created:
+            # Captcha.verify_google_recaptcha(
+            #     request.data.get("captcha_token", ""),
+            #     serializer.validated_data["email"],
+            # )
             user = AuthService.create_user(serializer.validated_data)
             token = get_tokens_for_user(user)
             resp_user = UserDetailSerializer(user)
@@ -51,7 +60,7 @@ class LoginView(APIView):
             mobile = serializer.validated_data.get("mobile")
             password = serializer.validated_data["password"]
             user = AuthService.get_user(email=email, mobile=mobile)
-            if not user or not user.check_password(password):
+            if not user or not hashing_pool.check_password(user, password):
                 return Response(
                     {"detail": "Invalid credentials"},
                     status=status.HTTP_401_UNAUTHORIZED,
@@ -75,6 +84,19 @@ class LoginView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class LogoutView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        AuthService.revoke_token(request.user, request.auth)
+        res = Response(
+            {"detail": "Logged out successfully"},
+            status=status.HTTP_200_OK,
+        )
+        res.delete_cookie("access_token", samesite="Lax")
+        return res
+
+
 class UserProfileView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -111,3 +133,18 @@ class ChangePasswordView(APIView):
                 status=status.HTTP_200_OK,
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class CacheStatsView(APIView):
+    """Hit rates of the authentication caches of the worker serving the request."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(
+            {
+                "pid": os.getpid(),
+                "user_cache": user_cache.stats(),
+                "token_cache": token_cache.stats(),
+            }
+        )
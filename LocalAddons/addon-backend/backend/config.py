@@ -13,12 +13,48 @@ DB_NAME = os.getenv("DB_NAME", "cimage_addon")
 DB_USER = os.getenv("DB_USER", "root")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "CimagE1122")
 
+LAST_SEEN_FLUSH_INTERVAL = int(os.getenv("LAST_SEEN_FLUSH_INTERVAL", "60"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "30"))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+TOKEN_REVOCATION_SYNC_INTERVAL = int(os.getenv("TOKEN_REVOCATION_SYNC_INTERVAL", "30"))
+
+CATALOGUE_CACHE_TIMEOUT = int(os.getenv("CATALOGUE_CACHE_TIMEOUT", "3600"))
+CATALOGUE_VERSION_POLL_INTERVAL = float(
+    os.getenv("CATALOGUE_VERSION_POLL_INTERVAL", "1")
+)
+EXPLORE_SNAPSHOT_MAX_AGE = int(os.getenv("EXPLORE_SNAPSHOT_MAX_AGE", "300"))
+COURSE_SEARCH_MAX_RESULTS = int(os.getenv("COURSE_SEARCH_MAX_RESULTS", "500"))
+
+PASSWORD_HASH_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS", "1000000"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "1"))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+PASSWORD_HASH_WAIT_TIMEOUT = float(os.getenv("PASSWORD_HASH_WAIT_TIMEOUT", "5"))
+
+ORDER_ID_WORKER_ID = int(os.getenv("ORDER_ID_WORKER_ID", "-1"))
+PAYMENT_CALLBACK_CACHE_TIMEOUT = int(
+    os.getenv("PAYMENT_CALLBACK_CACHE_TIMEOUT", "86400")
+)
+
+DEFAULT_PAYMENT_GATEWAY = os.getenv("DEFAULT_PAYMENT_GATEWAY", "icici")
+PAYMENT_GATEWAY_TIMEOUT = float(os.getenv("PAYMENT_GATEWAY_TIMEOUT", "10"))
+PAYMENT_GATEWAY_POOL_SIZE = int(os.getenv("PAYMENT_GATEWAY_POOL_SIZE", "10"))
+PAYMENT_GATEWAY_RETRIES = int(os.getenv("PAYMENT_GATEWAY_RETRIES", "2"))
+
 RAZORPAY_KEY_ID = os.getenv("RAZORPAY_KEY_ID", "")
 RAZORPAY_KEY_SECRET = os.getenv("RAZORPAY_KEY_SECRET", "")
 
+CASHFREE_CLIENT_ID = os.getenv("CASHFREE_CLIENT_ID", "")
+CASHFREE_CLIENT_SECRET = os.getenv("CASHFREE_CLIENT_SECRET", "")
+CASHFREE_API_URL = os.getenv("CASHFREE_API_URL", "https://api.cashfree.com/pg")
+
 ICICI_MERCHANT_ID = os.getenv("ICICI_MERCHANT_ID", "")
 ICICI_SUB_MERCHANT_ID = os.getenv("ICICI_SUB_MERCHANT_ID", "")
 ICICI_AES_KEY = os.getenv("ICICI_AES_KEY", "")
 
 HCAPTCHA_SECRET_KEY = os.getenv("H_CAPTCHA_SECRET_KEY", "")
 GOOGLE_RECAPTCHA_SECRET_KEY = os.getenv("GOOGLE_RECAPTCHA_SECRET_KEY", "")
+CAPTCHA_STUB = os.getenv("CAPTCHA_STUB", "False") == "True"
+CAPTCHA_TIMEOUT = float(os.getenv("CAPTCHA_TIMEOUT", "5"))
+CAPTCHA_POOL_SIZE = int(os.getenv("CAPTCHA_POOL_SIZE", "10"))
+CAPTCHA_CACHE_TTL = int(os.getenv("CAPTCHA_CACHE_TTL", "120"))
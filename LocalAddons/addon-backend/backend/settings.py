@@ -13,7 +13,35 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from datetime import timedelta
 from pathlib import Path
 
-from backend.config import DB_HOST, DB_NAME, DB_PASSWORD, DB_PORT, DB_USER, DEBUG
+from backend.config import (
+    CASHFREE_API_URL,
+    CASHFREE_CLIENT_ID,
+    CASHFREE_CLIENT_SECRET,
+    CATALOGUE_CACHE_TIMEOUT,
+    CATALOGUE_VERSION_POLL_INTERVAL,
+    COURSE_SEARCH_MAX_RESULTS,
+    DB_HOST,
+    DB_NAME,
+    DB_PASSWORD,
+    DB_PORT,
+    DB_USER,
+    DEBUG,
+    DEFAULT_PAYMENT_GATEWAY,
+    EXPLORE_SNAPSHOT_MAX_AGE,
+    LAST_SEEN_FLUSH_INTERVAL,
+    ORDER_ID_WORKER_ID,
+    PASSWORD_HASH_ITERATIONS,
+    PASSWORD_HASH_MAX_PENDING,
+    PASSWORD_HASH_WAIT_TIMEOUT,
+    PASSWORD_HASH_WORKERS,
+    PAYMENT_CALLBACK_CACHE_TIMEOUT,
+    RAZORPAY_KEY_ID,
+    RAZORPAY_KEY_SECRET,
+    TOKEN_CACHE_SIZE,
+    TOKEN_REVOCATION_SYNC_INTERVAL,
+    USER_CACHE_SIZE,
+    USER_CACHE_TTL,
+)
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -125,6 +153,24 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Same as Django's defaults, with PBKDF2 iterations driven by PASSWORD_HASH_ITERATIONS.
+# Hashes with a different iteration count are upgraded on the next login.
+PASSWORD_HASHERS = [
+    "accounts.hashers.TunablePBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+PASSWORD_HASH_ITERATIONS = PASSWORD_HASH_ITERATIONS
+
+# Per-process pool that bounds concurrent login and signup hashing. Every
+# process gets its own pool, so a deployment hashes on at most
+# PASSWORD_HASH_WORKERS x processes cores at once.
+PASSWORD_HASH_WORKERS = PASSWORD_HASH_WORKERS
+PASSWORD_HASH_MAX_PENDING = PASSWORD_HASH_MAX_PENDING
+PASSWORD_HASH_WAIT_TIMEOUT = PASSWORD_HASH_WAIT_TIMEOUT
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -157,15 +203,57 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 20,
 }
 
+# Seconds a versioned catalogue payload may stay cached, edits invalidate it sooner.
+# Also the most its enrollment and rating counters can lag behind
+CATALOGUE_CACHE_TIMEOUT = CATALOGUE_CACHE_TIMEOUT
+# Seconds a worker keeps the catalogue version it read before asking the DB again
+CATALOGUE_VERSION_POLL_INTERVAL = CATALOGUE_VERSION_POLL_INTERVAL
+# Seconds before a worker rebuilds its explore snapshot even if nothing changed
+EXPLORE_SNAPSHOT_MAX_AGE = EXPLORE_SNAPSHOT_MAX_AGE
+
+# Most ranked matches a ?q= course search returns, in relevance order
+COURSE_SEARCH_MAX_RESULTS = COURSE_SEARCH_MAX_RESULTS
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=7),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=15),
 }
 
+# Per-worker cache of validated access tokens, 0 disables it
+TOKEN_CACHE_SIZE = TOKEN_CACHE_SIZE
+
+# Seconds between pulls of newly revoked token ids into each worker
+TOKEN_REVOCATION_SYNC_INTERVAL = TOKEN_REVOCATION_SYNC_INTERVAL
+
+# Seconds between bulk writes of buffered last-seen timestamps, 0 writes inline
+LAST_SEEN_FLUSH_INTERVAL = LAST_SEEN_FLUSH_INTERVAL
+
+# Per-worker cache of authenticated User rows, 0 disables it
+USER_CACHE_SIZE = USER_CACHE_SIZE
+# Seconds another worker may keep authenticating a user after it is deactivated
+USER_CACHE_TTL = USER_CACHE_TTL
+
 
 # Payment Gateway Settings
 PAYMENT_GATEWAYS = {
-    "razorpay": {"payment_driver": "orders.gateways.razorpay.RazorpayGateway"},
-    "cashfree": {"payment_driver": "orders.gateways.cashfree.CashfreeGateway"},
+    "icici": {"payment_driver": "orders.gateways.icici.IciciGateway"},
+    "razorpay": {
+        "payment_driver": "orders.gateways.razorpay.RazorpayGateway",
+        "key_id": RAZORPAY_KEY_ID,
+        "key_secret": RAZORPAY_KEY_SECRET,
+    },
+    "cashfree": {
+        "payment_driver": "orders.gateways.cashfree.CashfreeGateway",
+        "api_url": CASHFREE_API_URL,
+        "client_id": CASHFREE_CLIENT_ID,
+        "client_secret": CASHFREE_CLIENT_SECRET,
+    },
 }
-DEFAULT_PAYMENT_GATEWAY = "razorpay"
+# Driver checkout uses when the caller names none
+DEFAULT_PAYMENT_GATEWAY = DEFAULT_PAYMENT_GATEWAY
+
+# Worker id (0-1023) embedded in generated order ids, -1 derives one per process
+ORDER_ID_WORKER_ID = ORDER_ID_WORKER_ID
+
+# Seconds the final status of a processed payment callback is remembered
+PAYMENT_CALLBACK_CACHE_TIMEOUT = PAYMENT_CALLBACK_CACHE_TIMEOUT
@@ -1,31 +1,184 @@
 import base64
+import threading
+import time
+from calendar import timegm
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
 
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import padding
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from django.db.models import Count, Max, QuerySet
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
 
 
 class AESCrypto:
+    """
+    AES-ECB with PKCS7 padding and base64 output. ECB handles every block on
+    its own, so one encryptor and decryptor per key are kept and fed whole
+    padded messages instead of expanding the key schedule for every field.
+    """
+
+    BLOCK_SIZE = 16
+
     def __init__(self, key: str) -> None:
         self.aes_key = key.encode()
+        self._encryptor = None
+        self._decryptor = None
+        self._lock = threading.Lock()
+
+    def _load_contexts(self) -> None:
+        # Lazy, so an unset key only fails when something is encrypted
+        if self._encryptor is None:
+            cipher = Cipher(
+                algorithms.AES(self.aes_key), modes.ECB(), backend=default_backend()
+            )
+            self._encryptor, self._decryptor = cipher.encryptor(), cipher.decryptor()
+
+    def _pad(self, plain_text: str) -> bytes:
+        data = plain_text.encode()
+        size = self.BLOCK_SIZE - len(data) % self.BLOCK_SIZE
+        return data + bytes([size]) * size
+
+    def encrypt_many(self, plain_texts) -> list[str]:
+        """Encrypt several fields with a single pass through the cipher."""
+        padded = [self._pad(plain_text) for plain_text in plain_texts]
+        with self._lock:
+            self._load_contexts()
+            encrypted = self._encryptor.update(b"".join(padded))
+        results, offset = [], 0
+        for data in padded:
+            chunk = encrypted[offset : offset + len(data)]
+            results.append(base64.b64encode(chunk).decode("utf-8"))
+            offset += len(data)
+        return results
 
     def encrypt_using_aes(self, plain_text: str) -> str:
-        cipher = Cipher(
-            algorithms.AES(self.aes_key), modes.ECB(), backend=default_backend()
-        )
-        encryptor = cipher.encryptor()
-        padder = padding.PKCS7(128).padder()
-        padded_data = padder.update(plain_text.encode()) + padder.finalize()
-        encrypted = encryptor.update(padded_data) + encryptor.finalize()
-        return base64.b64encode(encrypted).decode("utf-8")
+        return self.encrypt_many([plain_text])[0]
 
     def decrypt_using_aes(self, encrypted_base64: str) -> str:
         encrypted_bytes = base64.b64decode(encrypted_base64)
-        cipher = Cipher(
-            algorithms.AES(self.aes_key), modes.ECB(), backend=default_backend()
-        )
-        decryptor = cipher.decryptor()
-        decrypted_padded = decryptor.update(encrypted_bytes) + decryptor.finalize()
+        # A partial block would stay buffered in the shared decryptor
+        if len(encrypted_bytes) % self.BLOCK_SIZE:
+            raise ValueError(
+                "The length of the provided data is not a multiple of the block length."
+            )
+        with self._lock:
+            self._load_contexts()
+            decrypted_padded = self._decryptor.update(encrypted_bytes)
         unpadder = padding.PKCS7(128).unpadder()
         decrypted_data = unpadder.update(decrypted_padded) + unpadder.finalize()
         return decrypted_data.decode("utf-8")
+
+
+class TTLCache:
+    """
+    Thread-safe in-process LRU cache whose entries expire after ``ttl`` seconds.
+    Keeps hit and miss counters so callers can report its effectiveness.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class ConditionalGetMixin:
+    """
+    Lets read-only views answer ``If-None-Match`` / ``If-Modified-Since`` with
+    a 304 before the body is serialized. Validators come from a cache version
+    or from ``queryset_validators``, so an unchanged page costs at most one
+    aggregate query.
+    """
+
+    # Headers a per-user response varies on, see ``conditional_response``
+    user_vary_headers = ("Authorization", "Cookie")
+
+    @staticmethod
+    def queryset_validators(queryset: QuerySet) -> tuple[str | None, Any]:
+        """ETag and Last-Modified from the row count and newest ``updated_at``."""
+        stats = queryset.order_by().aggregate(
+            count=Count("pk"), last_modified=Max("updated_at")
+        )
+        if not stats["count"]:
+            return None, None
+        last_modified = stats["last_modified"]
+        return f"{stats['count']}-{last_modified.timestamp()}", last_modified
+
+    def conditional_response(
+        self,
+        request,
+        build: Callable[[], Any],
+        etag: str | None = None,
+        last_modified=None,
+        per_user: bool = False,
+    ):
+        """
+        Return 304 when the client's validators still match, otherwise
+        ``build()``. ``per_user`` scopes the ETag to the requesting user for
+        payloads that differ between users.
+        """
+        if etag is not None:
+            if per_user:
+                etag = f"{etag}-u{request.user.pk or 0}"
+            etag = "W/" + quote_etag(etag)
+        timestamp = last_modified and timegm(last_modified.utctimetuple())
+
+        response = None
+        if request.method in ("GET", "HEAD") and (etag or timestamp):
+            response = get_conditional_response(
+                request, etag=etag, last_modified=timestamp
+            )
+        if response is None:
+            response = build()
+        if 200 <= response.status_code < 300 or response.status_code == 304:
+            if etag:
+                response["ETag"] = etag
+            if timestamp:
+                response["Last-Modified"] = http_date(timestamp)
+            if per_user:
+                patch_vary_headers(response, self.user_vary_headers)
+        return response
@@ -1,5 +1,6 @@
 from django.db.models import QuerySet
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
 from .models import Community, Thread, ThreadMessage
 
@@ -18,12 +19,26 @@ def is_member(community: Community, user) -> bool:
     return community.members.filter(id=getattr(user, "id", None)).exists()
 
 
+def filter_published_community_by_lookup(lookup_value: str | int) -> QuerySet[Community]:
+    if str(lookup_value).isdigit():
+        return get_published_communities().filter(pk=lookup_value)
+    return get_published_communities().filter(slug=lookup_value)
+
+
+def touch_community(community: Community) -> None:
+    # Membership is part of the detail payload, so it must move the validators
+    community.updated_at = timezone.now()
+    Community.objects.filter(pk=community.pk).update(updated_at=community.updated_at)
+
+
 def add_member(community: Community, user) -> None:
     community.members.add(user)
+    touch_community(community)
 
 
 def remove_member(community: Community, user) -> None:
     community.members.remove(user)
+    touch_community(community)
 
 
 def list_threads_for_community(community_id: int) -> QuerySet[Thread]:
@@ -1,3 +1,42 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.models import User
+
+from . import services
+from .models import Community
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.community = Community.objects.create(
+            name="Python", slug="python", description="Python", published=True
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_unchanged_list_costs_one_aggregate_query(self):
+        response = self.client.get("/api/v1/communities/")
+        self.assertIn("Last-Modified", response)
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                "/api/v1/communities/", HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        self.assertEqual(response.status_code, 304)
+
+    def test_membership_change_invalidates_the_detail(self):
+        url = f"/api/v1/communities/{self.community.pk}/"
+        etag = self.client.get(url)["ETag"]
+        user = User.objects.create(
+            username="member", email="member@example.com", mobile="9000000000"
+        )
+        services.add_member(self.community, user)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["members"], [user.pk])
+
+    def test_missing_community_is_still_a_404(self):
+        response = self.client.get("/api/v1/communities/999/")
+        self.assertEqual(response.status_code, 404)
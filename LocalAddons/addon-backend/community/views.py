@@ -2,7 +2,8 @@ from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from accounts.auth import OptionalJWTAuthentication
+from accounts.auth import OptionalClaimsJWTAuthentication
+from backend.utils import ConditionalGetMixin
 
 from . import services
 from .models import Community, Thread, ThreadMessage
@@ -17,7 +18,7 @@ from .serializers import (
 )
 
 
-class CommunityView(viewsets.ReadOnlyModelViewSet):
+class CommunityView(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     queryset = services.get_published_communities()
 
     def get_permissions(self):
@@ -28,7 +29,7 @@ class CommunityView(viewsets.ReadOnlyModelViewSet):
     def get_authenticators(self):
         if "join" in self.request.path or "leave" in self.request.path:
             return super().get_authenticators()
-        return [OptionalJWTAuthentication()]
+        return [OptionalClaimsJWTAuthentication()]
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -41,13 +42,31 @@ class CommunityView(viewsets.ReadOnlyModelViewSet):
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        def build():
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+
+            serializer = self.get_serializer(queryset, many=True)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        etag, last_modified = self.queryset_validators(queryset)
+        return self.conditional_response(request, build, etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        etag, last_modified = self.queryset_validators(
+            services.filter_published_community_by_lookup(
+                self.kwargs.get(self.lookup_field)
+            )
+        )
+        return self.conditional_response(
+            request,
+            lambda: super(CommunityView, self).retrieve(request, *args, **kwargs),
+            etag,
+            last_modified,
+        )
 
     @action(detail=True, methods=["post"])
     def join(self, request, pk=None):
@@ -0,0 +1,127 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from .models import CatalogueChange, CatalogueVersion
+
+CATALOGUE_VERSION_KEY = "course:catalogue:version"
+
+# Most recent version bumps whose course ids are kept in CatalogueChange
+CHANGES_LIMIT = 1024
+
+
+class CatalogueCache:
+    """
+    Shared, user-independent catalogue payloads keyed by a version number.
+    Any change to the catalogue bumps the version, which orphans every entry
+    written under the old one instead of deleting keys one by one.
+
+    The version lives in the ``CatalogueVersion`` row so every worker agrees
+    on it; the cache only holds it for ``CATALOGUE_VERSION_POLL_INTERVAL``
+    seconds, which bounds how long a change made elsewhere goes unseen.
+
+    Only edits to the catalogue itself bump the version. Counters moved by
+    enrollments and ratings are left stale instead, for at most one
+    ``CATALOGUE_CACHE_TIMEOUT`` window, see ``get_generation``.
+    """
+
+    @staticmethod
+    def get_version() -> int:
+        version = cache.get(CATALOGUE_VERSION_KEY)
+        if version is None:
+            version = CatalogueCache._read_version()
+            cache.set(
+                CATALOGUE_VERSION_KEY,
+                version,
+                settings.CATALOGUE_VERSION_POLL_INTERVAL,
+            )
+        return version
+
+    @staticmethod
+    def get_generation() -> str:
+        """
+        The version plus the current ``CATALOGUE_CACHE_TIMEOUT`` window, for
+        payload keys and ETags, so counter changes show within one window.
+        """
+        window = int(time.time()) // max(settings.CATALOGUE_CACHE_TIMEOUT, 1)
+        return f"{CatalogueCache.get_version()}.{window}"
+
+    @staticmethod
+    def _read_version() -> int:
+        # Start from the clock so a lost row never revives old entries
+        return CatalogueVersion.objects.get_or_create(
+            pk=1, defaults={"version": time.time_ns()}
+        )[0].version
+
+    @staticmethod
+    def bump_version(course_ids=None) -> None:
+        """Bump the version, recording ``course_ids`` (None: anything) as changed."""
+        with transaction.atomic():
+            bumped = CatalogueVersion.objects.filter(pk=1).update(
+                version=F("version") + 1
+            )
+            version = CatalogueCache._read_version()
+            if bumped:
+                CatalogueChange.objects.create(
+                    version=version,
+                    course_ids=None if course_ids is None else sorted(course_ids),
+                )
+                CatalogueChange.objects.filter(
+                    version__lte=version - CHANGES_LIMIT
+                ).delete()
+        # Re-read on the next call rather than racing other bumps with a set
+        cache.delete(CATALOGUE_VERSION_KEY)
+
+    @staticmethod
+    def get_changes(since: int, until: int) -> set[int] | None:
+        """
+        Course ids changed between two versions, by any worker, or None when
+        a bump in between is unrecorded or did not name its courses.
+        """
+        if not 0 <= until - since <= CHANGES_LIMIT:
+            return None
+        changes = list(
+            CatalogueChange.objects.filter(
+                version__gt=since, version__lte=until
+            ).values_list("course_ids", flat=True)
+        )
+        if len(changes) != until - since or None in changes:
+            return None
+        return {course_id for course_ids in changes for course_id in course_ids}
+
+    @staticmethod
+    def get_or_build(request, build):
+        """Return the cached payload for this URL, or build and store it."""
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        url = f"{request.get_host()}{request.path}?{query}"
+        key = (
+            f"course:catalogue:{CatalogueCache.get_generation()}:"
+            f"{hashlib.md5(url.encode()).hexdigest()}"
+        )
+        payload = cache.get(key)
+        if payload is None:
+            payload = build()
+            cache.set(key, payload, settings.CATALOGUE_CACHE_TIMEOUT)
+        return payload
+
+    @staticmethod
+    def overlay_enrollment(payload, enrolled_course_ids):
+        """Copy a shared course payload with ``is_enrolled`` set for one user."""
+        if isinstance(payload, list):
+            return [
+                CatalogueCache.overlay_enrollment(item, enrolled_course_ids)
+                for item in payload
+            ]
+        if "results" in payload:
+            return {
+                **payload,
+                "results": CatalogueCache.overlay_enrollment(
+                    payload["results"], enrolled_course_ids
+                ),
+            }
+        return {**payload, "is_enrolled": payload["id"] in enrolled_course_ids}
@@ -0,0 +1,159 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from course.models import Course, CourseInstructor, CourseTechnology
+from course.search import CourseSearchIndex
+from course.services import CourseService
+
+TECHNOLOGIES = (
+    "python django react node docker kubernetes cloud pandas numpy sql postgres "
+    "mysql linux git graphql android kotlin swift rust golang java spring "
+    "terraform aws azure"
+).split()
+SYLLABLES = "ba ce di fo gu ka le mi no pu ra se ti vo xu ze".split()
+BENCH_INSTRUCTOR = "bench_instructor"
+
+
+def build_vocabulary(rng, size):
+    """Technology names plus pseudo-words, with Zipf weights like real text."""
+    words = list(TECHNOLOGIES)
+    while len(words) < size:
+        words.append("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    return words, [1 / rank for rank in range(1, len(words) + 1)]
+
+
+def legacy_search(query):
+    """The icontains scan the admin and a naive ?q= would run."""
+    return list(
+        Course.objects.filter(
+            Q(title__icontains=query)
+            | Q(description__icontains=query)
+            | Q(objectives__icontains=query)
+            | Q(technologies__name__icontains=query)
+        )
+        .distinct()
+        .values_list("pk", flat=True)[:20]
+    )
+
+
+def indexed_search(query):
+    return list(
+        CourseService.search_courses(Course.objects.all(), query).values_list(
+            "pk", flat=True
+        )[:20]
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare ?q= course search through the full-text index with an "
+        "icontains scan over synthetic, unpublished courses. The courses are "
+        "committed, because InnoDB only updates FULLTEXT indexes at commit, and "
+        "everything named bench-* is deleted again when the run ends."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--courses", type=int, default=30_000)
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--vocabulary", type=int, default=5000)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if not CourseSearchIndex.is_available():
+            self.stderr.write("No full-text backend for this database vendor.")
+            return
+        rng = random.Random(0)
+        words, weights = build_vocabulary(rng, options["vocabulary"])
+        # Leftovers of an interrupted run would skew the numbers
+        self.clean_up(options["batch_size"])
+        try:
+            self.seed(rng, words, weights, options["courses"], options["batch_size"])
+            queries = [
+                " ".join(rng.choices(words, weights, k=rng.choice((1, 2))))
+                for _ in range(options["queries"])
+            ]
+            self.report("before (icontains scan)", self.measure(legacy_search, queries))
+            self.report(
+                "after (full-text index)", self.measure(indexed_search, queries)
+            )
+        finally:
+            self.clean_up(options["batch_size"])
+
+    def seed(self, rng, words, weights, count, batch_size):
+        started = time.perf_counter()
+        instructor = CourseInstructor.objects.create(name=BENCH_INSTRUCTOR)
+        technologies = CourseTechnology.objects.bulk_create(
+            CourseTechnology(slug=f"bench-{word}", name=word.title(), sector="IT")
+            for word in TECHNOLOGIES
+        )
+        Through = Course.technologies.through
+        course_ids = []
+        for start in range(0, count, batch_size):
+            # Unpublished, so the live catalogue never lists them. bulk_create
+            # skips the signals, so neither the index nor the version is touched
+            courses = Course.objects.bulk_create(
+                Course(
+                    title=f"bench {i} {' '.join(rng.choices(words, weights, k=3))}",
+                    slug=f"bench-{i}",
+                    description=" ".join(rng.choices(words, weights, k=60)),
+                    objectives=" ".join(rng.choices(words, weights, k=20)),
+                    language="English",
+                    level="Beginner",
+                    thumbnail="https://example.com/thumbnail.png",
+                    instructor=instructor,
+                    duration="60",
+                    published=False,
+                )
+                for i in range(start, min(start + batch_size, count))
+            )
+            Through.objects.bulk_create(
+                Through(course_id=course.pk, coursetechnology_id=technology.pk)
+                for course in courses
+                for technology in rng.sample(technologies, 2)
+            )
+            course_ids.extend(course.pk for course in courses)
+        seeded = time.perf_counter()
+        CourseSearchIndex.update(course_ids, batch_size)
+        self.stdout.write(
+            f"Seeded {count} courses in {seeded - started:.1f}s, "
+            f"indexed {len(course_ids)} in {time.perf_counter() - seeded:.1f}s"
+        )
+
+    def clean_up(self, batch_size):
+        """Delete the bench-* rows and their index rows, without model signals."""
+        course_ids = list(
+            Course.objects.filter(slug__startswith="bench-").values_list(
+                "pk", flat=True
+            )
+        )
+        for start in range(0, len(course_ids), batch_size):
+            batch = course_ids[start : start + batch_size]
+            CourseSearchIndex.remove(batch)
+            Course.technologies.through.objects.filter(course_id__in=batch).delete()
+            courses = Course.objects.filter(pk__in=batch)
+            courses._raw_delete(courses.db)
+        for queryset in (
+            CourseTechnology.objects.filter(slug__startswith="bench-"),
+            CourseInstructor.objects.filter(name=BENCH_INSTRUCTOR),
+        ):
+            queryset._raw_delete(queryset.db)
+
+    def measure(self, search, queries):
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            search(query)
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    def report(self, label, timings):
+        timings.sort()
+        self.stdout.write(
+            f"{label}: mean {statistics.mean(timings):.2f}ms, "
+            f"p50 {timings[len(timings) // 2]:.2f}ms, "
+            f"p95 {timings[int(len(timings) * 0.95)]:.2f}ms"
+        )
@@ -0,0 +1,123 @@
+import csv
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from accounts.models import CIMAGE_EMAIL_DOMAIN, User
+from course.models import Course
+from course.services import CourseService
+
+
+class Command(BaseCommand):
+    help = (
+        "Enroll many users at once, read from a CSV of emails or selected by "
+        "email domain. Enrollments are bulk inserted in chunks and course "
+        "counters are recomputed once at the end."
+    )
+
+    def add_arguments(self, parser):
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument(
+            "--csv",
+            help="CSV with an 'email' column and an optional 'course' column "
+            "(id or slug) that overrides --course for that row.",
+        )
+        source.add_argument(
+            "--email-domain",
+            nargs="?",
+            const=CIMAGE_EMAIL_DOMAIN,
+            help=f"Enroll every user with this email domain "
+            f"(default: {CIMAGE_EMAIL_DOMAIN}).",
+        )
+        parser.add_argument(
+            "--course",
+            action="append",
+            dest="courses",
+            default=[],
+            help="Course id or slug to enroll into (repeatable).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        self.courses = {}
+        default_course_ids = [
+            self.resolve_course(lookup) for lookup in options["courses"]
+        ]
+        self.skipped = 0
+        if options["csv"]:
+            pairs = self.read_csv(
+                options["csv"], default_course_ids, options["batch_size"]
+            )
+        else:
+            if not default_course_ids:
+                raise CommandError("--email-domain needs at least one --course.")
+            pairs = self.read_domain(
+                options["email_domain"], default_course_ids, options["batch_size"]
+            )
+
+        started = time.perf_counter()
+        rows, inserted = CourseService.bulk_enroll(pairs, options["batch_size"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Read {rows} enrollment rows, inserted {inserted}, "
+                f"skipped {self.skipped} unknown users in {elapsed:.2f}s "
+                f"({rows / elapsed if elapsed else 0:.0f} rows/s)"
+            )
+        )
+
+    def resolve_course(self, lookup: str) -> int:
+        lookup = lookup.strip()
+        if lookup not in self.courses:
+            query = (
+                Q(slug=lookup) | Q(pk=lookup) if lookup.isdigit() else Q(slug=lookup)
+            )
+            course_id = (
+                Course.objects.filter(query).values_list("pk", flat=True).first()
+            )
+            if course_id is None:
+                raise CommandError(f"Unknown course: {lookup}")
+            self.courses[lookup] = course_id
+        return self.courses[lookup]
+
+    def read_domain(self, domain, course_ids, batch_size):
+        user_ids = (
+            User.objects.filter(email__endswith=f"@{domain}")
+            .values_list("pk", flat=True)
+            .iterator(chunk_size=batch_size)
+        )
+        for user_id in user_ids:
+            for course_id in course_ids:
+                yield user_id, course_id
+
+    def read_csv(self, path, default_course_ids, batch_size):
+        with open(path, newline="", encoding="utf-8-sig") as file:
+            reader = csv.DictReader(file)
+            fieldnames = reader.fieldnames or []
+            if "email" not in fieldnames:
+                raise CommandError("The CSV needs an 'email' column.")
+            if "course" not in fieldnames and not default_course_ids:
+                raise CommandError("Give a 'course' column or at least one --course.")
+            while rows := list(islice(reader, batch_size)):
+                # One lookup per chunk through the lower(email) index
+                user_ids = dict(
+                    User.objects.alias(email_lower=Lower("email"))
+                    .filter(
+                        email_lower__in={row["email"].strip().lower() for row in rows}
+                    )
+                    .annotate(email_key=Lower("email"))
+                    .values_list("email_key", "pk")
+                )
+                for row in rows:
+                    user_id = user_ids.get(row["email"].strip().lower())
+                    if user_id is None:
+                        self.skipped += 1
+                        continue
+                    course = (row.get("course") or "").strip()
+                    for course_id in (
+                        [self.resolve_course(course)] if course else default_course_ids
+                    ):
+                        yield user_id, course_id
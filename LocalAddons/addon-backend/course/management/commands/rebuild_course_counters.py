@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from course.services import CourseService
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute student, review and rating counters on Course from the "
+        "enrollment and rating tables. Run after bulk imports or to repair drift."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--course",
+            type=int,
+            action="append",
+            dest="course_ids",
+            help="Only rebuild this course id (repeatable). Defaults to all courses.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        updated = CourseService.rebuild_course_counters(
+            options["course_ids"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt counters for {updated} courses in "
+                f"{time.perf_counter() - started:.2f}s"
+            )
+        )
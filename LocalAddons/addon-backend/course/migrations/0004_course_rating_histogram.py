@@ -0,0 +1,57 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:34
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_rating_histogram(apps, schema_editor):
+    Course = apps.get_model("course", "Course")
+    CourseRating = apps.get_model("course", "CourseRating")
+    counts = CourseRating.objects.values("course_id", "rating").annotate(
+        total=Count("id")
+    )
+    courses = {}
+    for row in counts:
+        course = courses.setdefault(row["course_id"], Course(pk=row["course_id"]))
+        setattr(course, f"rating_{row['rating']}_count", row["total"])
+    Course.objects.bulk_update(
+        courses.values(),
+        [f"rating_{star}_count" for star in range(1, 6)],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("course", "0003_rename_price_course_discounted_price_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="rating_1_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_2_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_3_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_4_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="rating_5_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_histogram, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:35
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_rating_sum(apps, schema_editor):
+    Course = apps.get_model("course", "Course")
+    CourseRating = apps.get_model("course", "CourseRating")
+    sums = CourseRating.objects.values("course_id").annotate(total=Sum("rating"))
+    Course.objects.bulk_update(
+        [Course(pk=row["course_id"], rating_sum=row["total"]) for row in sums],
+        ["rating_sum"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("course", "0004_course_rating_histogram"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="rating_sum",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_sum, migrations.RunPython.noop),
+    ]
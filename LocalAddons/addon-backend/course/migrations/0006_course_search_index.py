@@ -0,0 +1,72 @@
+from django.db import migrations
+
+CREATE_SEARCH_TABLE = {
+    "sqlite": (
+        "CREATE VIRTUAL TABLE course_search USING fts5("
+        "title, description, objectives, technologies, "
+        "tokenize = 'porter unicode61')"
+    ),
+    "mysql": (
+        "CREATE TABLE course_search ("
+        "course_id BIGINT NOT NULL PRIMARY KEY, "
+        "title VARCHAR(200) NOT NULL, "
+        "description LONGTEXT NOT NULL, "
+        "objectives LONGTEXT NOT NULL, "
+        "technologies TEXT NOT NULL, "
+        "FULLTEXT KEY course_search_fulltext "
+        "(title, description, objectives, technologies)"
+        ") ENGINE=InnoDB"
+    ),
+}
+
+ID_COLUMN = {"sqlite": "rowid", "mysql": "course_id"}
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor not in CREATE_SEARCH_TABLE:
+        return
+    schema_editor.execute(CREATE_SEARCH_TABLE[vendor])
+
+    Course = apps.get_model("course", "Course")
+    technologies = {}
+    for course_id, name in Course.technologies.through.objects.values_list(
+        "course_id", "coursetechnology__name"
+    ):
+        technologies.setdefault(course_id, []).append(name)
+    rows = [
+        (
+            course_id,
+            title,
+            description,
+            objectives or "",
+            " ".join(technologies.get(course_id, [])),
+        )
+        for course_id, title, description, objectives in Course.objects.values_list(
+            "pk", "title", "description", "objectives"
+        )
+    ]
+    if rows:
+        with schema_editor.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO course_search ({ID_COLUMN[vendor]}, title, "
+                "description, objectives, technologies) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                rows,
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in CREATE_SEARCH_TABLE:
+        schema_editor.execute("DROP TABLE course_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("course", "0005_course_rating_sum"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
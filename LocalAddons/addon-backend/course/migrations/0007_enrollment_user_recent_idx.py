@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_revokedtoken"),
+        ("course", "0006_course_search_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="courseenrollment",
+            index=models.Index(
+                fields=["user", "-enrolled_at"], name="enrollment_user_recent_idx"
+            ),
+        ),
+    ]
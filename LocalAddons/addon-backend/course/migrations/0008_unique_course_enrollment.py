@@ -0,0 +1,49 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:48
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def dedupe_enrollments(apps, schema_editor):
+    """Keep the earliest enrollment per (course, user) and recount the courses."""
+    Course = apps.get_model("course", "Course")
+    CourseEnrollment = apps.get_model("course", "CourseEnrollment")
+    duplicates = (
+        CourseEnrollment.objects.values("course_id", "user_id")
+        .annotate(first_id=Min("id"), total=Count("id"))
+        .filter(total__gt=1)
+    )
+    course_ids = set()
+    for row in duplicates.iterator():
+        CourseEnrollment.objects.filter(
+            course_id=row["course_id"], user_id=row["user_id"]
+        ).exclude(pk=row["first_id"]).delete()
+        course_ids.add(row["course_id"])
+    counts = (
+        CourseEnrollment.objects.filter(course_id__in=course_ids)
+        .values("course_id")
+        .annotate(total=Count("id"))
+    )
+    Course.objects.bulk_update(
+        [Course(pk=row["course_id"], student_count=row["total"]) for row in counts],
+        ["student_count"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_revokedtoken"),
+        ("course", "0007_enrollment_user_recent_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_enrollments, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="courseenrollment",
+            constraint=models.UniqueConstraint(
+                fields=("course", "user"), name="unique_course_enrollment"
+            ),
+        ),
+    ]
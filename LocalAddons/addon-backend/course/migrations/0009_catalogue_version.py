@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-17 22:09
+
+import time
+
+from django.db import migrations, models
+
+
+def seed_version(apps, schema_editor):
+    """Start from the clock so the new version never matches a cached one."""
+    CatalogueVersion = apps.get_model("course", "CatalogueVersion")
+    CatalogueVersion.objects.get_or_create(pk=1, defaults={"version": time.time_ns()})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("course", "0008_unique_course_enrollment"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogueVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version", models.BigIntegerField()),
+            ],
+        ),
+        migrations.RunPython(seed_version, migrations.RunPython.noop),
+    ]
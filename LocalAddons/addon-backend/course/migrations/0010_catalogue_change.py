@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-17 22:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("course", "0009_catalogue_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogueChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version", models.BigIntegerField(unique=True)),
+                ("course_ids", models.JSONField(null=True)),
+            ],
+        ),
+    ]
@@ -67,6 +67,12 @@ class Course(models.Model):
     student_count = models.IntegerField(default=0)
     avg_rating = models.FloatField(default=0)
     review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    rating_1_count = models.IntegerField(default=0)
+    rating_2_count = models.IntegerField(default=0)
+    rating_3_count = models.IntegerField(default=0)
+    rating_4_count = models.IntegerField(default=0)
+    rating_5_count = models.IntegerField(default=0)
     published = models.BooleanField(default=False)
     open_for_enrollment = models.BooleanField(default=False)
     featured = models.BooleanField(default=False)
@@ -76,6 +82,12 @@ class Course(models.Model):
     def __str__(self):
         return self.title
 
+    @property
+    def rating_histogram(self):
+        return {
+            str(star): getattr(self, f"rating_{star}_count") for star in range(1, 6)
+        }
+
 
 class CourseLesson(models.Model):
     title = models.CharField(max_length=200)
@@ -107,6 +119,13 @@ class CourseRating(models.Model):
     def __str__(self):
         return f"Rating {self.rating} by {self.user.username} for {self.course.title}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what the course counters currently include for this row
+        instance._loaded_values = (instance.course_id, instance.rating)
+        return instance
+
 
 # This is seperate so that we could track enrollment data, like progress, completion, etc.
 class CourseEnrollment(models.Model):
@@ -116,5 +135,37 @@ class CourseEnrollment(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="enrollments")
     enrolled_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["course", "user"], name="unique_course_enrollment"
+            ),
+        ]
+        indexes = [
+            # A student's most recent enrollments first, see get_user_enrolled_courses
+            models.Index(
+                fields=["user", "-enrolled_at"], name="enrollment_user_recent_idx"
+            ),
+        ]
+
     def __str__(self):
         return f"{self.user.username} enrolled in {self.course.title}"
+
+
+class CatalogueVersion(models.Model):
+    """Single row bumped on every catalogue change, see ``CatalogueCache``."""
+
+    version = models.BigIntegerField()
+
+    def __str__(self):
+        return str(self.version)
+
+
+class CatalogueChange(models.Model):
+    """Course ids behind one version bump, null when any course may have changed."""
+
+    version = models.BigIntegerField(unique=True)
+    course_ids = models.JSONField(null=True)
+
+    def __str__(self):
+        return f"{self.version}: {self.course_ids}"
@@ -0,0 +1,35 @@
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+
+class RatingCursorPagination(CursorPagination):
+    page_size = 10
+    ordering = "-created_at"
+
+
+class EnrollmentCursorPagination(CursorPagination):
+    """
+    Keyset pages over a student's enrollments. ``count`` is kept for the
+    dashboard totals; it is answered from the enrollment index, not the rows.
+    """
+
+    ordering = "-enrolled_at"
+
+    def paginate_queryset(self, queryset, request, view=None, count=None):
+        self.count = count
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.count,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count"] = {"type": "integer", "example": 123}
+        return response_schema
@@ -0,0 +1,195 @@
+import re
+
+from django.db import connection
+from django.db.models import Func, IntegerField, Value
+
+from .models import Course
+
+SEARCH_TABLE = "course_search"
+
+# Column order of the index, shared by every backend
+SEARCH_COLUMNS = ("title", "description", "objectives", "technologies")
+
+# bm25 weight per column, a title hit outranks a description hit
+SQLITE_COLUMN_WEIGHTS = (10.0, 1.0, 2.0, 5.0)
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class SQLiteSearchBackend:
+    """FTS5 table whose rowid is the course id."""
+
+    @staticmethod
+    def build_query(terms: list[str]) -> str:
+        # Quote every term so user input can never be parsed as FTS5 syntax
+        return " AND ".join(f'"{term}"*' for term in terms)
+
+    @staticmethod
+    def search(cursor, terms: list[str], limit: int) -> list[int]:
+        weights = ", ".join(str(weight) for weight in SQLITE_COLUMN_WEIGHTS)
+        cursor.execute(
+            f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s "
+            f"ORDER BY bm25({SEARCH_TABLE}, {weights}) LIMIT %s",
+            [SQLiteSearchBackend.build_query(terms), limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def delete(cursor, course_ids: list[int]) -> None:
+        cursor.executemany(
+            f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s",
+            [(course_id,) for course_id in course_ids],
+        )
+
+    @staticmethod
+    def insert(cursor, rows: list[tuple]) -> None:
+        placeholders = ", ".join(["%s"] * (len(SEARCH_COLUMNS) + 1))
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, {', '.join(SEARCH_COLUMNS)}) "
+            f"VALUES ({placeholders})",
+            rows,
+        )
+
+
+class MySQLSearchBackend:
+    """InnoDB table with a FULLTEXT index over every search column."""
+
+    @staticmethod
+    def build_query(terms: list[str]) -> str:
+        return " ".join(f"+{term}*" for term in terms)
+
+    @staticmethod
+    def search(cursor, terms: list[str], limit: int) -> list[int]:
+        match = f"MATCH ({', '.join(SEARCH_COLUMNS)}) AGAINST (%s IN BOOLEAN MODE)"
+        query = MySQLSearchBackend.build_query(terms)
+        cursor.execute(
+            f"SELECT course_id FROM {SEARCH_TABLE} WHERE {match} "
+            f"ORDER BY {match} DESC LIMIT %s",
+            [query, query, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def delete(cursor, course_ids: list[int]) -> None:
+        cursor.executemany(
+            f"DELETE FROM {SEARCH_TABLE} WHERE course_id = %s",
+            [(course_id,) for course_id in course_ids],
+        )
+
+    @staticmethod
+    def insert(cursor, rows: list[tuple]) -> None:
+        placeholders = ", ".join(["%s"] * (len(SEARCH_COLUMNS) + 1))
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (course_id, {', '.join(SEARCH_COLUMNS)}) "
+            f"VALUES ({placeholders})",
+            rows,
+        )
+
+
+class SearchPosition(Func):
+    """
+    Orders rows by where their id sits in a ranked id list. It binds the list
+    as one string parameter instead of a CASE branch per id, which Django is
+    slow to compile for hundreds of results.
+    """
+
+    function = "FIND_IN_SET"
+    output_field = IntegerField()
+
+    def __init__(self, expression, course_ids):
+        super().__init__(
+            expression, Value(",".join(str(course_id) for course_id in course_ids))
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        id_sql, id_params = compiler.compile(self.source_expressions[0])
+        list_sql, list_params = compiler.compile(self.source_expressions[1])
+        return (
+            f"instr(',' || {list_sql} || ',', ',' || {id_sql} || ',')",
+            [*list_params, *id_params],
+        )
+
+
+SEARCH_BACKENDS = {
+    "sqlite": SQLiteSearchBackend,
+    "mysql": MySQLSearchBackend,
+}
+
+
+class CourseSearchIndex:
+    """
+    Full-text index over course title, description, objectives and technology
+    names. It lives in its own table (FTS5 on SQLite, FULLTEXT on MySQL), is
+    written from model signals and returns course ids best match first.
+    """
+
+    @staticmethod
+    def get_backend():
+        return SEARCH_BACKENDS.get(connection.vendor)
+
+    @staticmethod
+    def is_available() -> bool:
+        return CourseSearchIndex.get_backend() is not None
+
+    @staticmethod
+    def tokenize(query: str) -> list[str]:
+        return TOKEN_RE.findall(query.lower())
+
+    @staticmethod
+    def search(query: str, limit: int) -> list[int]:
+        terms = CourseSearchIndex.tokenize(query)
+        if not terms:
+            return []
+        with connection.cursor() as cursor:
+            return CourseSearchIndex.get_backend().search(cursor, terms, limit)
+
+    @staticmethod
+    def get_rows(course_ids: list[int]) -> list[tuple]:
+        technologies = {}
+        for course_id, name in Course.technologies.through.objects.filter(
+            course_id__in=course_ids
+        ).values_list("course_id", "coursetechnology__name"):
+            technologies.setdefault(course_id, []).append(name)
+        return [
+            (
+                course_id,
+                title,
+                description,
+                objectives or "",
+                " ".join(technologies.get(course_id, [])),
+            )
+            for course_id, title, description, objectives in Course.objects.filter(
+                pk__in=course_ids
+            ).values_list("pk", "title", "description", "objectives")
+        ]
+
+    @staticmethod
+    def update(course_ids, batch_size: int = 500) -> None:
+        """Rewrite the index rows of ``course_ids``, dropping deleted courses."""
+        backend = CourseSearchIndex.get_backend()
+        if backend is None:
+            return
+        course_ids = list(course_ids)
+        with connection.cursor() as cursor:
+            for start in range(0, len(course_ids), batch_size):
+                batch = course_ids[start : start + batch_size]
+                backend.delete(cursor, batch)
+                backend.insert(cursor, CourseSearchIndex.get_rows(batch))
+
+    @staticmethod
+    def remove(course_ids) -> None:
+        backend = CourseSearchIndex.get_backend()
+        if backend is None:
+            return
+        with connection.cursor() as cursor:
+            backend.delete(cursor, list(course_ids))
+
+    @staticmethod
+    def rebuild(batch_size: int = 500) -> int:
+        if not CourseSearchIndex.is_available():
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        course_ids = list(Course.objects.values_list("pk", flat=True))
+        CourseSearchIndex.update(course_ids, batch_size)
+        return len(course_ids)
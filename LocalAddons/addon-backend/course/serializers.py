@@ -2,11 +2,13 @@ from rest_framework import serializers
 
 from .models import (
     Course,
-    CourseEnrollment,
     CourseLesson,
     CourseRating,
     CourseTechnology,
 )
+from .services import CourseService
+
+RATINGS_PREVIEW_SIZE = 3
 
 
 class CourseTechnologySerializer(serializers.ModelSerializer):
@@ -52,7 +54,31 @@ class CourseBaseSerializer(serializers.ModelSerializer):
         ]
 
 
-class CourseOverviewSerializer(serializers.ModelSerializer):
+class EnrollmentStatusMixin:
+    """
+    Resolves ``is_enrolled`` from the requesting user's enrolled course ids,
+    loaded once and kept in the serializer context. Nested and ``many=True``
+    serializers share the root context, so a whole page costs one query. A
+    lone course is answered by one probe of the (course, user) unique index.
+    """
+
+    def get_is_enrolled(self, obj):
+        enrolled_course_ids = self.context.get("enrolled_course_ids")
+        if enrolled_course_ids is None:
+            request = self.context.get("request")
+            if not (request and request.user.is_authenticated):
+                enrolled_course_ids = frozenset()
+            elif self.parent is None:
+                return CourseService.is_user_enrolled(request.user, obj.id)
+            else:
+                enrolled_course_ids = CourseService.get_enrolled_course_ids(
+                    request.user
+                )
+            self.context["enrolled_course_ids"] = enrolled_course_ids
+        return obj.id in enrolled_course_ids
+
+
+class CourseOverviewSerializer(EnrollmentStatusMixin, serializers.ModelSerializer):
     is_enrolled = serializers.SerializerMethodField()
 
     class Meta:
@@ -77,32 +103,32 @@ class CourseOverviewSerializer(serializers.ModelSerializer):
             "open_for_enrollment",
         ]
 
+
+class EnrolledCourseSerializer(CourseOverviewSerializer):
+    enrolled_at = serializers.DateTimeField(read_only=True)
+
+    class Meta(CourseOverviewSerializer.Meta):
+        fields = [*CourseOverviewSerializer.Meta.fields, "enrolled_at"]
+
     def get_is_enrolled(self, obj):
-        request = self.context.get("request")
-        if request and request.user.is_authenticated:
-            return CourseEnrollment.objects.filter(
-                course=obj, user=request.user
-            ).exists()
-        return False
+        return True
 
 
-class CourseDetailSerializer(serializers.ModelSerializer):
+class CourseDetailSerializer(EnrollmentStatusMixin, serializers.ModelSerializer):
     curriculum = CourseLessonSerializer(many=True, read_only=True)
-    ratings = CourseRatingSerializer(many=True, read_only=True)
+    ratings = serializers.SerializerMethodField()
+    rating_histogram = serializers.ReadOnlyField()
     is_enrolled = serializers.SerializerMethodField()
 
     class Meta:
         depth = 1
         model = Course
-        fields = "__all__"
+        exclude = ["rating_sum", *(f"rating_{star}_count" for star in range(1, 6))]
 
-    def get_is_enrolled(self, obj):
-        request = self.context.get("request")
-        if request and request.user.is_authenticated:
-            return CourseEnrollment.objects.filter(
-                course=obj, user=request.user
-            ).exists()
-        return False
+    def get_ratings(self, obj):
+        # Only a short preview, the full list is paginated under courses/<id>/ratings/
+        ratings = CourseService.get_course_ratings(obj)[:RATINGS_PREVIEW_SIZE]
+        return CourseRatingSerializer(ratings, many=True).data
 
 
 class ExploreTechnologySerializer(serializers.ModelSerializer):
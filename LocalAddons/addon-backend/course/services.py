@@ -1,7 +1,28 @@
-from django.db.models import Prefetch, QuerySet
+from itertools import islice
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Count,
+    F,
+    FloatField,
+    Max,
+    Model,
+    OuterRef,
+    Prefetch,
+    Q,
+    QuerySet,
+    Subquery,
+    Sum,
+    prefetch_related_objects,
+)
+from django.db.models.functions import Cast, Coalesce, NullIf
 from django.shortcuts import get_object_or_404
+from rest_framework import serializers
 
-from .models import Course, CourseEnrollment, CourseTechnology
+from .models import Course, CourseEnrollment, CourseRating, CourseTechnology
+from .search import CourseSearchIndex, SearchPosition
 
 
 class CourseService:
@@ -28,21 +49,344 @@ class CourseService:
         return queryset
 
     @staticmethod
-    def get_published_course_by_lookup(lookup_value: str | int) -> Course:
+    def search_courses(
+        queryset: QuerySet[Course], query: str | None
+    ) -> QuerySet[Course]:
+        """Narrow ``queryset`` to courses matching ``query``, best match first."""
+        if not query or not query.strip():
+            return queryset
+        if not CourseSearchIndex.is_available():
+            return queryset.filter(
+                Q(title__icontains=query)
+                | Q(description__icontains=query)
+                | Q(objectives__icontains=query)
+                | Q(technologies__name__icontains=query)
+            ).distinct()
+        course_ids = CourseSearchIndex.search(query, settings.COURSE_SEARCH_MAX_RESULTS)
+        return queryset.filter(pk__in=course_ids).order_by(
+            SearchPosition("pk", course_ids)
+        )
+
+    @staticmethod
+    def get_published_course_by_lookup(
+        lookup_value: str | int, queryset: QuerySet[Course] | None = None
+    ) -> Course:
+        queryset = Course.objects.all() if queryset is None else queryset
         if str(lookup_value).isdigit():
-            return get_object_or_404(Course, pk=lookup_value, published=True)
-        return get_object_or_404(Course, slug=lookup_value, published=True)
+            return get_object_or_404(queryset, pk=lookup_value, published=True)
+        return get_object_or_404(queryset, slug=lookup_value, published=True)
+
+    @staticmethod
+    def optimize_for_serializer(
+        queryset: QuerySet, serializer_class: type[serializers.BaseSerializer]
+    ) -> QuerySet:
+        """Apply the select_related/prefetch_related joins the serializer will read."""
+        select_related, prefetch_related = CourseService.get_related_lookups(
+            serializer_class(), queryset.model
+        )
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+    @staticmethod
+    def prefetch_for_serializer(
+        instances, serializer_class: type[serializers.BaseSerializer]
+    ) -> None:
+        """Like ``optimize_for_serializer`` for rows that are already loaded."""
+        if not instances:
+            return
+        select_related, prefetch_related = CourseService.get_related_lookups(
+            serializer_class(), type(instances[0])
+        )
+        prefetch_related_objects(instances, *select_related, *prefetch_related)
+
+    @staticmethod
+    def get_related_lookups(
+        serializer: serializers.BaseSerializer, model: type[Model]
+    ) -> tuple[list[str], list[Prefetch]]:
+        """
+        Walk the serializer's fields and return the joins needed to render
+        ``model`` rows without lazy loads. Single-valued relations become
+        select_related lookups; to-many relations become Prefetch objects whose
+        querysets carry the joins of the nested serializer, recursively.
+        """
+        select_related, prefetch_related = [], []
+        for field in serializer.fields.values():
+            if field.write_only or field.source == "*":
+                continue
+
+            path, related_model, is_many = [], model, False
+            for attr in field.source.split("."):
+                model_field = CourseService.get_model_field(related_model, attr)
+                if model_field is None or not model_field.is_relation:
+                    break
+                path.append(attr)
+                related_model = model_field.related_model
+                if model_field.many_to_many or model_field.one_to_many:
+                    is_many = True
+                    break
+            if not path:
+                continue
+
+            lookup = "__".join(path)
+            nested = (
+                field.child if isinstance(field, serializers.ListSerializer) else field
+            )
+            if isinstance(nested, serializers.BaseSerializer):
+                inner_select, inner_prefetch = CourseService.get_related_lookups(
+                    nested, related_model
+                )
+            else:
+                inner_select, inner_prefetch = [], []
+
+            if is_many:
+                related_queryset = related_model._default_manager.all()
+                if inner_select:
+                    related_queryset = related_queryset.select_related(*inner_select)
+                if inner_prefetch:
+                    related_queryset = related_queryset.prefetch_related(
+                        *inner_prefetch
+                    )
+                prefetch_related.append(Prefetch(lookup, queryset=related_queryset))
+            elif isinstance(field, serializers.PrimaryKeyRelatedField):
+                # Reads the local *_id column, no join needed
+                continue
+            else:
+                select_related.append(lookup)
+                select_related.extend(f"{lookup}__{inner}" for inner in inner_select)
+                prefetch_related.extend(
+                    Prefetch(
+                        f"{lookup}__{inner.prefetch_through}", queryset=inner.queryset
+                    )
+                    for inner in inner_prefetch
+                )
+        return select_related, prefetch_related
+
+    @staticmethod
+    def get_model_field(model: type[Model], attr: str):
+        """Resolve a serializer source attribute, including reverse accessors like ``cartitem_set``."""
+        try:
+            return model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            for related in model._meta.related_objects:
+                if related.get_accessor_name() == attr:
+                    return related
+        return None
+
+    @staticmethod
+    def get_course_ratings(course: Course) -> QuerySet[CourseRating]:
+        return (
+            CourseRating.objects.filter(course=course)
+            .select_related("user")
+            .order_by("-created_at")
+        )
 
     @staticmethod
     def enroll_user_in_course(user, course: Course) -> tuple[CourseEnrollment, bool]:
-        return CourseEnrollment.objects.get_or_create(course=course, user=user)
+        """
+        Insert first and fall back to the existing row on a (course, user)
+        conflict, so concurrent callbacks cannot create or count a duplicate.
+        """
+        try:
+            with transaction.atomic():
+                return CourseEnrollment.objects.create(course=course, user=user), True
+        except IntegrityError:
+            return CourseEnrollment.objects.get(course=course, user=user), False
+
+    @staticmethod
+    def enroll_user_in_courses(user, course_ids) -> set[int]:
+        """
+        Enroll ``user`` in several courses with a fixed number of statements,
+        whatever their count. Returns the ids of the new enrollments.
+        """
+        with transaction.atomic():
+            course_ids = set(
+                Course.objects.filter(pk__in=course_ids).values_list("pk", flat=True)
+            )
+            new_course_ids = course_ids - CourseService.get_enrolled_course_ids(
+                user, course_ids
+            )
+            CourseEnrollment.objects.bulk_create(
+                [
+                    CourseEnrollment(course_id=course_id, user_id=user.pk)
+                    for course_id in new_course_ids
+                ],
+                ignore_conflicts=True,
+            )
+            # Recounted rather than incremented: a concurrent enrollment the
+            # pre-read missed is skipped by ignore_conflicts and must not count
+            Course.objects.filter(pk__in=new_course_ids).update(
+                student_count=Coalesce(
+                    Subquery(
+                        CourseEnrollment.objects.filter(course_id=OuterRef("pk"))
+                        .order_by()
+                        .values("course_id")
+                        .annotate(total=Count("id"))
+                        .values("total")
+                    ),
+                    0,
+                )
+            )
+        return new_course_ids
 
     @staticmethod
-    def get_user_enrolled_courses(user) -> list[Course]:
-        enrollments = CourseEnrollment.objects.filter(user=user).select_related(
-            "course"
+    def is_user_enrolled(user, course_id: int) -> bool:
+        return CourseEnrollment.objects.filter(
+            course_id=course_id, user_id=user.pk
+        ).exists()
+
+    @staticmethod
+    def bulk_enroll(pairs, batch_size: int = 1000) -> tuple[int, int]:
+        """
+        Enroll a stream of ``(user_id, course_id)`` pairs in chunks without
+        per-row signals, then recompute the touched courses' counters once.
+        Returns the number of pairs read and of enrollments inserted.
+        """
+        pairs = iter(pairs)
+        rows = inserted = 0
+        course_ids = set()
+        try:
+            while chunk := list(islice(pairs, batch_size)):
+                rows += len(chunk)
+                chunk = set(chunk)
+                # ignore_conflicts absorbs races on the unique (course, user)
+                # constraint, reading existing pairs keeps ``inserted`` exact
+                existing = set(
+                    CourseEnrollment.objects.filter(
+                        user_id__in={user_id for user_id, _ in chunk},
+                        course_id__in={course_id for _, course_id in chunk},
+                    ).values_list("user_id", "course_id")
+                )
+                enrollments = [
+                    CourseEnrollment(user_id=user_id, course_id=course_id)
+                    for user_id, course_id in chunk - existing
+                ]
+                CourseEnrollment.objects.bulk_create(enrollments, ignore_conflicts=True)
+                inserted += len(enrollments)
+                course_ids.update(enrollment.course_id for enrollment in enrollments)
+        finally:
+            # Also after a failed chunk, so committed chunks are counted
+            if course_ids:
+                CourseService.rebuild_course_counters(course_ids)
+        return rows, inserted
+
+    @staticmethod
+    def get_enrolled_course_ids(user, course_ids=None) -> set[int]:
+        """The user's enrolled course ids, limited to ``course_ids`` if given."""
+        enrollments = CourseEnrollment.objects.filter(user_id=user.pk)
+        if course_ids is not None:
+            enrollments = enrollments.filter(course_id__in=course_ids)
+        return set(enrollments.values_list("course_id", flat=True))
+
+    @staticmethod
+    def get_user_enrolled_courses(user) -> QuerySet[Course]:
+        """The user's courses, annotated with ``enrolled_at``, newest first."""
+        return (
+            Course.objects.filter(enrollments__user_id=user.pk)
+            .annotate(enrolled_at=F("enrollments__enrolled_at"))
+            .order_by("-enrolled_at")
         )
-        return [enrollment.course for enrollment in enrollments]
+
+    @staticmethod
+    def get_enrollment_stamp(user) -> str:
+        """Changes whenever the user gains or loses an enrollment, for ETags."""
+        stats = CourseEnrollment.objects.filter(user_id=user.pk).aggregate(
+            count=Count("pk"), last_id=Max("pk")
+        )
+        return f"{stats['count']}.{stats['last_id'] or 0}"
+
+    @staticmethod
+    def count_user_enrollments(user) -> int:
+        return CourseEnrollment.objects.filter(user_id=user.pk).count()
+
+    @staticmethod
+    def apply_enrollment_delta(course_id: int, delta: int) -> None:
+        Course.objects.filter(pk=course_id).update(
+            student_count=F("student_count") + delta
+        )
+
+    @staticmethod
+    def apply_rating_delta(course_id: int, rating: int, delta: int) -> None:
+        """Add (``delta=1``) or remove (``delta=-1``) one rating from the counters."""
+        histogram_field = f"rating_{rating}_count"
+        with transaction.atomic():
+            Course.objects.filter(pk=course_id).update(
+                review_count=F("review_count") + delta,
+                rating_sum=F("rating_sum") + delta * rating,
+                **{histogram_field: F(histogram_field) + delta},
+            )
+            # Separate statement: MySQL evaluates SET clauses left to right
+            Course.objects.filter(pk=course_id).update(
+                avg_rating=Coalesce(
+                    Cast("rating_sum", FloatField())
+                    / Cast(NullIf("review_count", 0), FloatField()),
+                    0.0,
+                )
+            )
+
+    @staticmethod
+    def rebuild_course_counters(course_ids=None, batch_size: int = 500) -> int:
+        """
+        Recompute enrollment and rating counters from scratch with grouped
+        aggregates, for every course or only ``course_ids``. Returns the number
+        of courses written.
+        """
+        courses = Course.objects.all()
+        enrollments = CourseEnrollment.objects.all()
+        ratings = CourseRating.objects.all()
+        if course_ids is not None:
+            courses = courses.filter(pk__in=course_ids)
+            enrollments = enrollments.filter(course_id__in=course_ids)
+            ratings = ratings.filter(course_id__in=course_ids)
+
+        student_counts = dict(
+            enrollments.values("course_id")
+            .annotate(total=Count("id"))
+            .values_list("course_id", "total")
+        )
+        rating_counts = {}
+        for course_id, rating, total, rating_sum in (
+            ratings.values("course_id", "rating")
+            .annotate(total=Count("id"), rating_sum=Sum("rating"))
+            .values_list("course_id", "rating", "total", "rating_sum")
+        ):
+            rating_counts.setdefault(course_id, {})[rating] = (total, rating_sum)
+
+        histogram_fields = [f"rating_{star}_count" for star in range(1, 6)]
+        updated = []
+        for course_id in courses.values_list("pk", flat=True).iterator():
+            per_star = rating_counts.get(course_id, {})
+            review_count = sum(total for total, _ in per_star.values())
+            rating_sum = sum(star_sum for _, star_sum in per_star.values())
+            updated.append(
+                Course(
+                    pk=course_id,
+                    student_count=student_counts.get(course_id, 0),
+                    review_count=review_count,
+                    rating_sum=rating_sum,
+                    avg_rating=rating_sum / review_count if review_count else 0.0,
+                    **{
+                        field: per_star.get(star, (0, 0))[0]
+                        for star, field in enumerate(histogram_fields, start=1)
+                    },
+                )
+            )
+
+        with transaction.atomic():
+            Course.objects.bulk_update(
+                updated,
+                [
+                    "student_count",
+                    "review_count",
+                    "rating_sum",
+                    "avg_rating",
+                    *histogram_fields,
+                ],
+                batch_size=batch_size,
+            )
+        return len(updated)
 
     @staticmethod
     def get_course_technology_by_lookup(lookup_value: str | int) -> CourseTechnology:
@@ -52,14 +396,22 @@ class CourseService:
 
     @staticmethod
     def get_all_technologies():
-        featured_courses_qs = Course.objects.filter(featured=True)
-        courses = CourseTechnology.objects.prefetch_related(
+        courses = CourseTechnology.objects.order_by("pk").prefetch_related(
             Prefetch(
-                "courses", queryset=featured_courses_qs, to_attr="featured_courses"
+                "courses",
+                queryset=CourseService.get_explore_courses(),
+                to_attr="featured_courses",
             )
         )
         return courses
 
+    @staticmethod
+    def get_explore_courses(course_ids=None) -> QuerySet[Course]:
+        queryset = Course.objects.filter(published=True, featured=True).order_by("pk")
+        if course_ids is not None:
+            queryset = queryset.filter(pk__in=course_ids)
+        return queryset
+
     @staticmethod
     def filter_technology_by_sector(queryset, sector):
         if sector:
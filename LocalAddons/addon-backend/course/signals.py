@@ -1,24 +1,116 @@
-from django.db import models
-from django.db.models.signals import post_delete, post_save
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
-from .models import Course, CourseEnrollment, CourseRating
+from .caching import CatalogueCache
+from .models import (
+    Course,
+    CourseEnrollment,
+    CourseInstructor,
+    CourseLesson,
+    CourseRating,
+    CourseTechnology,
+)
+from .search import CourseSearchIndex
+from .services import CourseService
 
 
 @receiver([post_save, post_delete], sender=CourseEnrollment)
-def update_student_count(sender, instance, **kwargs):
-    course = instance.course
-    student_count = CourseEnrollment.objects.filter(course=course).count()
-    course.student_count = student_count
-    course.save(update_fields=["student_count"])
+def update_student_count(sender, instance, signal, created=False, **kwargs):
+    if signal is post_delete:
+        CourseService.apply_enrollment_delta(instance.course_id, -1)
+    elif created:
+        CourseService.apply_enrollment_delta(instance.course_id, 1)
 
 
 @receiver([post_save, post_delete], sender=CourseRating)
-def update_course_rating(sender, instance, **kwargs):
-    course = instance.course
-    ratings = CourseRating.objects.filter(course=course)
-    review_count = ratings.count()
-    avg_rating = ratings.aggregate(models.Avg("rating"))["rating__avg"] or 0.0
-    course.review_count = review_count
-    course.avg_rating = avg_rating
-    course.save(update_fields=["review_count", "avg_rating"])
+def update_course_rating(sender, instance, signal, created=False, **kwargs):
+    current = (instance.course_id, instance.rating)
+    previous = getattr(instance, "_loaded_values", None)
+    with transaction.atomic():
+        if signal is post_delete:
+            CourseService.apply_rating_delta(*(previous or current), -1)
+        elif created:
+            CourseService.apply_rating_delta(*current, 1)
+        elif previous is None:
+            # Saved without being loaded first, so the old rating is unknown
+            CourseService.rebuild_course_counters([instance.course_id])
+        elif previous != current:
+            CourseService.apply_rating_delta(*previous, -1)
+            CourseService.apply_rating_delta(*current, 1)
+    instance._loaded_values = current
+
+
+# Only catalogue edits bump the version, enrollments and ratings never do, see
+# CatalogueCache. Bumps run after commit, so a concurrent rebuild cannot cache
+# pre-change rows under the new version
+
+
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=CourseLesson)
+def bump_course_version(sender, instance, **kwargs):
+    course_id = instance.pk if sender is Course else instance.course_id
+    transaction.on_commit(partial(CatalogueCache.bump_version, [course_id]))
+
+
+@receiver(m2m_changed, sender=Course.technologies.through)
+def bump_course_technologies_version(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if not action.startswith("post_"):
+        return
+    # A cleared technology reports no pk_set, so every course may have changed
+    course_ids = frozenset(pk_set) if reverse and pk_set else None
+    if not reverse:
+        course_ids = [instance.pk]
+    transaction.on_commit(partial(CatalogueCache.bump_version, course_ids))
+
+
+@receiver([post_save, post_delete], sender=CourseTechnology)
+@receiver([post_save, post_delete], sender=CourseInstructor)
+def bump_catalogue_version(sender, **kwargs):
+    transaction.on_commit(CatalogueCache.bump_version)
+
+
+@receiver(post_save, sender=Course)
+def index_course(sender, instance, **kwargs):
+    CourseSearchIndex.update([instance.pk])
+
+
+@receiver(post_delete, sender=Course)
+def unindex_course(sender, instance, **kwargs):
+    CourseSearchIndex.remove([instance.pk])
+
+
+@receiver(m2m_changed, sender=Course.technologies.through)
+def index_course_technologies(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith("post_"):
+            CourseSearchIndex.update([instance.pk])
+    elif action == "pre_clear":
+        instance._search_course_ids = list(
+            instance.courses.values_list("pk", flat=True)
+        )
+    elif action == "post_clear":
+        CourseSearchIndex.update(instance._search_course_ids)
+    elif action in ("post_add", "post_remove"):
+        CourseSearchIndex.update(pk_set)
+
+
+@receiver(pre_delete, sender=CourseTechnology)
+def collect_technology_courses(sender, instance, **kwargs):
+    # The through rows are gone by post_delete, so remember the courses now
+    instance._search_course_ids = list(instance.courses.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=CourseTechnology)
+@receiver(post_delete, sender=CourseTechnology)
+def index_technology_courses(sender, instance, created=False, **kwargs):
+    if created:
+        return
+    course_ids = getattr(instance, "_search_course_ids", None)
+    if course_ids is None:
+        course_ids = instance.courses.values_list("pk", flat=True)
+    CourseSearchIndex.update(course_ids)
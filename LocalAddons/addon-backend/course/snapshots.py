@@ -0,0 +1,101 @@
+import threading
+import time
+
+from django.conf import settings
+
+from .caching import CatalogueCache
+from .models import Course
+from .serializers import CourseBaseSerializer, ExploreTechnologySerializer
+from .services import CourseService
+
+
+class ExploreSnapshot:
+    """
+    ``TechnologyView.explore`` payload materialized in process memory, with
+    only published, featured courses. Reads compare the catalogue version and
+    return the prebuilt list. When every bump since names its courses, on
+    whichever worker it was made, just those courses are re-read; any other
+    change (a technology edit) rebuilds the whole snapshot, as does reaching
+    ``EXPLORE_SNAPSHOT_MAX_AGE`` seconds since the last full build.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._version = None
+        self._built_at = float("-inf")
+        self._technologies: dict[int, dict] = {}
+        # course id -> (technology ids, serialized course)
+        self._courses: dict[int, tuple[frozenset, dict]] = {}
+        self._payloads: dict[str | None, list] = {}
+
+    def get(self, sector: str | None = None) -> list:
+        version = CatalogueCache.get_version()
+        if version != self._version or self._is_expired():
+            with self._lock:
+                if version != self._version or self._is_expired():
+                    self._refresh(version)
+        return self._payloads.get(sector or None, [])
+
+    def _is_expired(self) -> bool:
+        return time.monotonic() - self._built_at >= settings.EXPLORE_SNAPSHOT_MAX_AGE
+
+    def _refresh(self, version: int) -> None:
+        changed = None
+        if self._version is not None and not self._is_expired():
+            changed = CatalogueCache.get_changes(self._version, version)
+        if changed is None or not self._load_courses(changed):
+            self._load_all()
+            self._built_at = time.monotonic()
+        self._payloads = self._compose()
+        self._version = version
+
+    def _load_all(self) -> None:
+        technologies, courses = {}, {}
+        for technology in ExploreTechnologySerializer(
+            CourseService.get_all_technologies(), many=True
+        ).data:
+            technology = dict(technology)
+            for course in technology.pop("courses"):
+                technology_ids, _ = courses.get(course["id"], (frozenset(), None))
+                courses[course["id"]] = (technology_ids | {technology["id"]}, course)
+            technologies[technology["id"]] = technology
+        self._technologies, self._courses = technologies, courses
+
+    def _load_courses(self, course_ids) -> bool:
+        """Re-read ``course_ids``; False if they reference an unknown technology."""
+        featured = list(CourseService.get_explore_courses(course_ids))
+        technology_ids = {}
+        for course_id, technology_id in Course.technologies.through.objects.filter(
+            course_id__in=[course.pk for course in featured]
+        ).values_list("course_id", "coursetechnology_id"):
+            technology_ids.setdefault(course_id, set()).add(technology_id)
+        if any(not ids <= self._technologies.keys() for ids in technology_ids.values()):
+            return False
+
+        courses = dict(self._courses)
+        for course_id in course_ids:
+            courses.pop(course_id, None)
+        for course in CourseBaseSerializer(featured, many=True).data:
+            courses[course["id"]] = (
+                frozenset(technology_ids.get(course["id"], ())),
+                course,
+            )
+        self._courses = courses
+        return True
+
+    def _compose(self) -> dict[str | None, list]:
+        courses_by_technology = {pk: [] for pk in self._technologies}
+        for course_id in sorted(self._courses):
+            technology_ids, course = self._courses[course_id]
+            for technology_id in technology_ids:
+                courses_by_technology[technology_id].append(course)
+
+        payloads = {None: []}
+        for pk, technology in self._technologies.items():
+            item = {**technology, "courses": courses_by_technology[pk]}
+            payloads[None].append(item)
+            payloads.setdefault(technology["sector"], []).append(item)
+        return payloads
+
+
+explore_snapshot = ExploreSnapshot()
@@ -1,3 +1,646 @@
+import os
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib import admin
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from orders.models import Cart, CartItem
+
+from .admin import CourseAdmin
+from .caching import CATALOGUE_VERSION_KEY, CatalogueCache
+from .models import (
+    CatalogueChange,
+    CatalogueVersion,
+    Course,
+    CourseEnrollment,
+    CourseInstructor,
+    CourseLesson,
+    CourseRating,
+    CourseTechnology,
+)
+from .pagination import EnrollmentCursorPagination
+from .services import CourseService
+from .snapshots import ExploreSnapshot
+
+
+def create_course(index, instructor, technology):
+    course = Course.objects.create(
+        title=f"Course {index}",
+        description="Description",
+        slug=f"course-{index}",
+        language="English",
+        level="Beginner",
+        thumbnail="https://example.com/thumbnail.png",
+        instructor=instructor,
+        duration="60",
+        published=True,
+    )
+    course.technologies.add(technology)
+    return course
+
+
+class EnrollmentStatusQueryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            username="student", email="student@example.com", mobile="9000000000"
+        )
+        instructor = CourseInstructor.objects.create(name="Instructor")
+        technology = CourseTechnology.objects.create(
+            slug="python", name="Python", sector="IT"
+        )
+        cls.courses = [create_course(i, instructor, technology) for i in range(20)]
+        for course in cls.courses[::2]:
+            CourseEnrollment.objects.create(course=course, user=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_with_enrollment_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        enrollment_queries = [
+            query
+            for query in queries.captured_queries
+            if "course_courseenrollment" in query["sql"]
+        ]
+        return response, len(enrollment_queries)
+
+    def test_course_list_resolves_is_enrolled_in_one_query(self):
+        response, enrollment_queries = self.get_with_enrollment_queries(
+            "/api/v1/courses/"
+        )
+        self.assertEqual(response.status_code, 200)
+        # One for the ETag's enrollment stamp, one for the overlay
+        self.assertEqual(enrollment_queries, 2)
+        enrolled = {course.id for course in self.courses[::2]}
+        for item in response.data["results"]:
+            self.assertEqual(item["is_enrolled"], item["id"] in enrolled)
+
+    def test_course_detail_resolves_is_enrolled_in_one_query(self):
+        response, enrollment_queries = self.get_with_enrollment_queries(
+            f"/api/v1/courses/{self.courses[0].slug}/"
+        )
+        self.assertEqual(response.status_code, 200)
+        # One for the ETag's enrollment stamp, one for the overlay
+        self.assertEqual(enrollment_queries, 2)
+        self.assertTrue(response.data["is_enrolled"])
+
+    def test_enrolled_courses_resolve_is_enrolled_in_one_extra_query(self):
+        response, enrollment_queries = self.get_with_enrollment_queries(
+            "/api/v1/courses/enrolled/"
+        )
+        self.assertEqual(response.status_code, 200)
+        # One query for the enrolled page, one for the enrollment count
+        self.assertEqual(enrollment_queries, 2)
+        self.assertTrue(all(item["is_enrolled"] for item in response.data["results"]))
+
+    def test_enrolled_courses_are_keyset_paginated_newest_first(self):
+        enrollments = CourseEnrollment.objects.filter(user=self.user)
+        for offset, enrollment in enumerate(enrollments):
+            enrollment.enrolled_at = enrollment.enrolled_at.replace(year=2000 + offset)
+            enrollment.save()
+        expected = list(
+            enrollments.order_by("-enrolled_at").values_list("course_id", flat=True)
+        )
+
+        seen, url = [], "/api/v1/courses/enrolled/"
+        while url:
+            with (
+                mock.patch.object(EnrollmentCursorPagination, "page_size", 3),
+                self.assertNumQueries(3),
+            ):
+                response = self.client.get(url)
+            self.assertEqual(response.data["count"], len(expected))
+            seen += [item["id"] for item in response.data["results"]]
+            self.assertTrue(
+                all(item["enrolled_at"] for item in response.data["results"])
+            )
+            url = response.data["next"]
+        self.assertEqual(seen, expected)
+
+    def test_cart_resolves_is_enrolled_in_one_query(self):
+        cart = Cart.objects.create(user=self.user)
+        for course in self.courses:
+            CartItem.objects.create(cart=cart, product=course)
+        response, enrollment_queries = self.get_with_enrollment_queries("/api/v1/cart/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(enrollment_queries, 1)
+        self.assertEqual(
+            sum(item["product"]["is_enrolled"] for item in response.data["items"]), 10
+        )
+
+
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            username="student", email="student@example.com", mobile="9000000000"
+        )
+        cls.instructor = CourseInstructor.objects.create(name="Instructor")
+        cls.technology = CourseTechnology.objects.create(
+            slug="python", name="Python", sector="IT"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_courses(self, start, count, extras):
+        for index in range(start, start + count):
+            course = create_course(index, self.instructor, self.technology)
+            for extra in range(extras):
+                CourseLesson.objects.create(title=f"Lesson {extra}", course=course)
+                reviewer = User.objects.create(
+                    username=f"reviewer-{index}-{extra}",
+                    email=f"reviewer-{index}-{extra}@example.com",
+                    mobile=f"8{index:04d}{extra:05d}",
+                )
+                CourseRating.objects.create(course=course, user=reviewer, rating=5)
+        return course
+
+    def test_course_list_query_budget(self):
+        # Each cold cache also re-reads the catalogue version, and the ETag
+        # reads the user's enrollment stamp
+        self.add_courses(0, 2, extras=0)
+        with self.assertNumQueries(6):
+            self.client.get("/api/v1/courses/")
+
+        cache.clear()
+        self.add_courses(2, 18, extras=0)
+        with self.assertNumQueries(6):
+            response = self.client.get("/api/v1/courses/")
+        self.assertEqual(len(response.data["results"]), 20)
+
+    def test_course_detail_query_budget(self):
+        small = self.add_courses(0, 1, extras=1)
+        large = self.add_courses(1, 1, extras=25)
+        for course in (small, large):
+            cache.clear()
+            with self.assertNumQueries(7):
+                response = self.client.get(f"/api/v1/courses/{course.slug}/")
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["ratings"]), 3)
+        self.assertEqual(response.data["review_count"], 25)
+        self.assertEqual(response.data["rating_histogram"]["5"], 25)
+
+    def test_course_ratings_are_cursor_paginated(self):
+        course = self.add_courses(0, 1, extras=25)
+        with self.assertNumQueries(2):
+            response = self.client.get(f"/api/v1/courses/{course.slug}/ratings/")
+        self.assertEqual(len(response.data["results"]), 10)
+
+        seen = {rating["id"] for rating in response.data["results"]}
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            seen.update(rating["id"] for rating in response.data["results"])
+        self.assertEqual(len(seen), 25)
+
+    def test_cart_query_budget(self):
+        cart = Cart.objects.create(user=self.user)
+        for course in [self.add_courses(0, 1, 0), self.add_courses(1, 1, 0)]:
+            CartItem.objects.create(cart=cart, product=course)
+        with self.assertNumQueries(4):
+            self.client.get("/api/v1/cart/")
+
+        for index in range(2, 12):
+            CartItem.objects.create(cart=cart, product=self.add_courses(index, 1, 0))
+        with self.assertNumQueries(4):
+            self.client.get("/api/v1/cart/")
+
+
+class CourseCounterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        instructor = CourseInstructor.objects.create(name="Instructor")
+        technology = CourseTechnology.objects.create(
+            slug="python", name="Python", sector="IT"
+        )
+        cls.course = create_course(0, instructor, technology)
+        cls.users = [
+            User.objects.create(
+                username=f"student-{index}",
+                email=f"student-{index}@example.com",
+                mobile=f"900000000{index}",
+            )
+            for index in range(3)
+        ]
+
+    def assert_counters_match_rebuild(self):
+        self.course.refresh_from_db()
+        incremental = self.course.__dict__.copy()
+        CourseService.rebuild_course_counters([self.course.pk])
+        self.course.refresh_from_db()
+        for field in ("student_count", "review_count", "rating_sum", "avg_rating"):
+            self.assertEqual(incremental[field], getattr(self.course, field), field)
+        self.assertEqual(
+            {star: incremental[f"rating_{star}_count"] for star in range(1, 6)},
+            {int(star): count for star, count in self.course.rating_histogram.items()},
+        )
+
+    def test_enrollment_counter_is_incremental(self):
+        enrollments = [
+            CourseEnrollment.objects.create(course=self.course, user=user)
+            for user in self.users
+        ]
+        enrollments[0].delete()
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.student_count, 2)
+        self.assert_counters_match_rebuild()
+
+    def test_rating_counters_follow_create_update_and_delete(self):
+        ratings = [
+            CourseRating.objects.create(course=self.course, user=user, rating=star)
+            for user, star in zip(self.users, (5, 4, 3))
+        ]
+        rating = CourseRating.objects.get(pk=ratings[0].pk)
+        rating.rating = 1
+        rating.save()
+        CourseRating.objects.get(pk=ratings[1].pk).delete()
+
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.review_count, 2)
+        self.assertEqual(self.course.rating_sum, 4)
+        self.assertEqual(self.course.avg_rating, 2.0)
+        self.assertEqual(self.course.rating_1_count, 1)
+        self.assertEqual(self.course.rating_5_count, 0)
+        self.assert_counters_match_rebuild()
+
+
+class CourseSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = CourseInstructor.objects.create(name="Instructor")
+        cls.technology = CourseTechnology.objects.create(
+            slug="python", name="Python", sector="IT"
+        )
+        cls.courses = [
+            create_course(index, cls.instructor, cls.technology) for index in range(3)
+        ]
+
+    def search(self, query):
+        # Catalogue invalidation runs on commit, which TestCase never reaches
+        cache.clear()
+        response = APIClient().get("/api/v1/courses/", {"q": query})
+        return [course["id"] for course in response.data["results"]]
+
+    def test_title_matches_rank_above_description_matches(self):
+        title_match, description_match, _ = self.courses
+        description_match.description = "Build dashboards with pandas"
+        description_match.save()
+        title_match.title = "Pandas for analysts"
+        title_match.save()
+
+        self.assertEqual(self.search("pandas"), [title_match.pk, description_match.pk])
+
+    def test_index_follows_technology_changes(self):
+        self.assertEqual(len(self.search("python")), 3)
+        self.technology.name = "Rust"
+        self.technology.save()
+        self.assertEqual(self.search("python"), [])
+        self.courses[0].technologies.clear()
+        self.assertEqual(sorted(self.search("rust")), [c.pk for c in self.courses[1:]])
+
+    def test_deleted_courses_leave_the_index(self):
+        self.courses[0].delete()
+        self.assertEqual(len(self.search("course")), 2)
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(self.search('"c++ OR (NEAR'), [])
+
+    def test_admin_matches_part_of_a_slug_or_instructor(self):
+        course_admin = CourseAdmin(Course, admin.site)
+        for term in ("rse-1", "instruct"):
+            queryset, _ = course_admin.get_search_results(
+                None, Course.objects.all(), term
+            )
+            self.assertIn(self.courses[1], queryset)
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        instructor = CourseInstructor.objects.create(name="Instructor")
+        technology = CourseTechnology.objects.create(
+            slug="python", name="Python", sector="IT"
+        )
+        cls.course = create_course(0, instructor, technology)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_unchanged_catalogue_is_answered_without_queries(self):
+        etag = self.client.get("/api/v1/courses/")["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/v1/courses/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_catalogue_change_invalidates_the_etag(self):
+        etag = self.client.get(f"/api/v1/courses/{self.course.slug}/")["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.title = "Renamed"
+            self.course.save()
+        response = self.client.get(
+            f"/api/v1/courses/{self.course.slug}/", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["title"], "Renamed")
+
+    def test_etag_is_shared_between_workers(self):
+        etag = self.client.get("/api/v1/courses/")["ETag"]
+        # A worker with a cold cache derives the same ETag from the database
+        cache.clear()
+        response = self.client.get("/api/v1/courses/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_enrollment_changes_only_that_users_etag(self):
+        user = User.objects.create(
+            username="student", email="student@example.com", mobile="9000000000"
+        )
+        url = f"/api/v1/courses/{self.course.slug}/"
+        anonymous_etag = self.client.get(url)["ETag"]
+        self.client.force_authenticate(user)
+        etag = self.client.get(url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            CourseService.enroll_user_in_course(user, self.course)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["is_enrolled"])
+        self.client.force_authenticate(None)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=anonymous_etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_counters_are_stale_for_at_most_one_cache_window(self):
+        user = User.objects.create(
+            username="student", email="student@example.com", mobile="9000000000"
+        )
+        url = f"/api/v1/courses/{self.course.slug}/"
+        now = time.time()
+        with mock.patch("course.caching.time.time", return_value=now):
+            etag = self.client.get(url)["ETag"]
+            with self.captureOnCommitCallbacks(execute=True):
+                CourseService.enroll_user_in_course(user, self.course)
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+        later = now + settings.CATALOGUE_CACHE_TIMEOUT
+        with mock.patch("course.caching.time.time", return_value=later):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["student_count"], 1)
+
+    def test_etag_is_scoped_to_the_user(self):
+        user = User.objects.create(
+            username="student", email="student@example.com", mobile="9000000000"
+        )
+        etag = self.client.get("/api/v1/courses/")["ETag"]
+        self.client.force_authenticate(user)
+        response = self.client.get("/api/v1/courses/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Authorization", response["Vary"])
+
+
+class CatalogueVersionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def bump_elsewhere(self):
+        # Another worker's bump, this process's cache never hears of it
+        CatalogueVersion.objects.filter(pk=1).update(version=F("version") + 1)
+
+    def test_version_is_read_once_per_poll_interval(self):
+        version = CatalogueCache.get_version()
+        self.bump_elsewhere()
+        with self.assertNumQueries(0):
+            self.assertEqual(CatalogueCache.get_version(), version)
+        cache.delete(CATALOGUE_VERSION_KEY)
+        self.assertEqual(CatalogueCache.get_version(), version + 1)
+
+    def test_bump_is_shared_through_the_database(self):
+        version = CatalogueCache.get_version()
+        CatalogueCache.bump_version([1])
+        self.assertEqual(CatalogueVersion.objects.get(pk=1).version, version + 1)
+        self.assertEqual(CatalogueCache.get_version(), version + 1)
+        self.assertEqual(CatalogueCache.get_changes(version, version + 1), {1})
+
+    def test_enrollment_and_rating_leave_the_version_alone(self):
+        instructor = CourseInstructor.objects.create(name="Instructor")
+        technology = CourseTechnology.objects.create(
+            slug="python", name="Python", sector="IT"
+        )
+        course = create_course(0, instructor, technology)
+        user = User.objects.create(
+            username="student", email="student@example.com", mobile="9000000000"
+        )
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                CourseService.enroll_user_in_course(user, course)
+                CourseService.enroll_user_in_courses(user, [course.pk])
+                CourseRating.objects.create(course=course, user=user, rating=4)
+        self.assertFalse([q for q in queries if "course_catalogueversion" in q["sql"]])
+
+    def test_unrecorded_bump_hides_the_changed_courses(self):
+        version = CatalogueCache.get_version()
+        self.bump_elsewhere()
+        CatalogueCache.bump_version([1])
+        self.assertIsNone(CatalogueCache.get_changes(version, version + 2))
+
+    def test_changes_beyond_the_kept_history_are_unknown(self):
+        version = CatalogueCache.get_version()
+        CatalogueCache.bump_version([1])
+        CatalogueCache.bump_version([2])
+        self.assertEqual(CatalogueCache.get_changes(version, version + 2), {1, 2})
+        with mock.patch("course.caching.CHANGES_LIMIT", 1):
+            CatalogueCache.bump_version([3])
+            self.assertIsNone(CatalogueCache.get_changes(version, version + 3))
+        self.assertFalse(CatalogueChange.objects.filter(version=version + 1))
+
+
+class ExploreSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = CourseInstructor.objects.create(name="Instructor")
+        cls.python = CourseTechnology.objects.create(
+            slug="python", name="Python", sector="IT"
+        )
+        cls.courses = [create_course(i, cls.instructor, cls.python) for i in range(3)]
+        Course.objects.filter(pk__in=[cls.courses[0].pk, cls.courses[1].pk]).update(
+            featured=True
+        )
+        Course.objects.filter(pk=cls.courses[1].pk).update(published=False)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.snapshot = ExploreSnapshot()
+
+    def course_ids(self, sector=None):
+        return {
+            technology["slug"]: [course["id"] for course in technology["courses"]]
+            for technology in self.snapshot.get(sector)
+        }
+
+    def test_only_published_featured_courses_are_listed(self):
+        self.assertEqual(self.course_ids(), {"python": [self.courses[0].pk]})
+        self.assertEqual(self.course_ids("Management"), {})
+
+    def test_flag_change_patches_only_that_course(self):
+        self.snapshot.get()
+        course = self.courses[2]
+        with self.captureOnCommitCallbacks(execute=True):
+            course.featured = True
+            course.save()
+        # The version and the changes since, then only the changed course and
+        # its technologies
+        with self.assertNumQueries(4):
+            self.assertEqual(
+                self.course_ids("IT"),
+                {"python": [self.courses[0].pk, course.pk]},
+            )
+        with self.assertNumQueries(0):
+            self.snapshot.get("IT")
+
+    def test_change_from_another_worker_patches_only_that_course(self):
+        self.snapshot.get()
+        course = self.courses[2]
+        Course.objects.filter(pk=course.pk).update(featured=True)
+        # The other worker's bump, recorded where every worker can read it
+        CatalogueCache.bump_version([course.pk])
+        with mock.patch.object(
+            self.snapshot, "_load_all", wraps=self.snapshot._load_all
+        ) as load_all:
+            self.assertEqual(
+                self.course_ids(), {"python": [self.courses[0].pk, course.pk]}
+            )
+        load_all.assert_not_called()
+
+    def test_snapshot_is_rebuilt_past_its_maximum_age(self):
+        self.snapshot.get()
+        # A change no version bump reported, e.g. made from a shell
+        Course.objects.filter(pk=self.courses[2].pk).update(featured=True)
+        self.assertEqual(self.course_ids(), {"python": [self.courses[0].pk]})
+        with mock.patch(
+            "course.snapshots.time.monotonic",
+            return_value=time.monotonic() + settings.EXPLORE_SNAPSHOT_MAX_AGE,
+        ):
+            self.assertEqual(
+                self.course_ids(),
+                {"python": [self.courses[0].pk, self.courses[2].pk]},
+            )
+
+    def test_technology_change_moves_the_course(self):
+        self.snapshot.get()
+        rust = CourseTechnology.objects.create(
+            slug="rust", name="Rust", sector="Management"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.courses[0].technologies.set([rust])
+        self.assertEqual(
+            self.course_ids(), {"python": [], "rust": [self.courses[0].pk]}
+        )
+        self.assertEqual(self.course_ids("Management"), {"rust": [self.courses[0].pk]})
+
+    def test_explore_endpoint_serves_the_snapshot(self):
+        response = self.client.get("/api/v1/technologies/explore/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [course["id"] for course in response.data[0]["courses"]],
+            [self.courses[0].pk],
+        )
+
+
+class BulkEnrollmentTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        instructor = CourseInstructor.objects.create(name="Instructor")
+        technology = CourseTechnology.objects.create(
+            slug="python", name="Python", sector="IT"
+        )
+        cls.courses = [create_course(i, instructor, technology) for i in range(2)]
+        cls.users = [
+            User.objects.create(
+                username=f"student-{index}",
+                email=f"student-{index}@{domain}",
+                mobile=f"900000000{index}",
+            )
+            for index, domain in enumerate(["cimage.in", "cimage.in", "example.com"])
+        ]
+        CourseEnrollment.objects.create(course=cls.courses[0], user=cls.users[0])
+
+    def test_bulk_enroll_skips_existing_and_recounts_once(self):
+        pairs = [(user.pk, self.courses[0].pk) for user in self.users] * 2
+        with self.assertNumQueries(9):
+            rows, inserted = CourseService.bulk_enroll(pairs, batch_size=4)
+        self.assertEqual((rows, inserted), (6, 2))
+        self.courses[0].refresh_from_db()
+        self.assertEqual(self.courses[0].student_count, 3)
+        self.assertEqual(CourseEnrollment.objects.count(), 3)
+
+    def test_repeated_enrollment_is_a_no_op(self):
+        course, user = self.courses[1], self.users[2]
+        first, created = CourseService.enroll_user_in_course(user, course)
+        self.assertTrue(created)
+        again, created = CourseService.enroll_user_in_course(user, course)
+        self.assertFalse(created)
+        self.assertEqual(again.pk, first.pk)
+        course.refresh_from_db()
+        self.assertEqual(course.student_count, 1)
+
+    def test_enrollment_racing_the_pre_read_is_not_counted_twice(self):
+        course, user = self.courses[0], self.users[0]
+        # The existing enrollment committed after this request's pre-read
+        with mock.patch.object(
+            CourseService, "get_enrolled_course_ids", return_value=set()
+        ):
+            CourseService.enroll_user_in_courses(user, [course.pk, self.courses[1].pk])
+        course.refresh_from_db()
+        self.assertEqual(course.student_count, 1)
+        self.courses[1].refresh_from_db()
+        self.assertEqual(self.courses[1].student_count, 1)
+
+    def test_command_enrolls_an_email_domain(self):
+        call_command(
+            "bulk_enroll",
+            "--email-domain",
+            "--course",
+            self.courses[1].slug,
+            stdout=StringIO(),
+        )
+        self.assertEqual(
+            set(
+                CourseEnrollment.objects.filter(course=self.courses[1]).values_list(
+                    "user_id", flat=True
+                )
+            ),
+            {self.users[0].pk, self.users[1].pk},
+        )
 
-# Create your tests here.
+    def test_command_reads_a_csv(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as file:
+            file.write("email,course\n")
+            file.write(f"STUDENT-2@example.com,{self.courses[1].pk}\n")
+            file.write("missing@example.com,\n")
+        self.addCleanup(os.remove, file.name)
+        stdout = StringIO()
+        call_command("bulk_enroll", "--csv", file.name, stdout=stdout)
+        self.assertTrue(
+            CourseEnrollment.objects.filter(
+                course=self.courses[1], user=self.users[2]
+            ).exists()
+        )
+        self.assertIn("skipped 1 unknown users", stdout.getvalue())
@@ -4,19 +4,24 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
-from accounts.auth import OptionalJWTAuthentication
+from accounts.auth import OptionalClaimsJWTAuthentication
+from backend.utils import ConditionalGetMixin
 from course.models import Course, CourseEnrollment, CourseTechnology
 
+from .caching import CatalogueCache
+from .pagination import EnrollmentCursorPagination, RatingCursorPagination
 from .serializers import (
     CourseDetailSerializer,
     CourseOverviewSerializer,
+    CourseRatingSerializer,
     CourseTechnologySerializer,
-    ExploreTechnologySerializer,
+    EnrolledCourseSerializer,
 )
 from .services import CourseService
+from .snapshots import explore_snapshot
 
 
-class CourseView(ReadOnlyModelViewSet):
+class CourseView(ConditionalGetMixin, ReadOnlyModelViewSet):
     queryset = CourseService.get_published_courses()
 
     def get_permissions(self):
@@ -27,7 +32,7 @@ class CourseView(ReadOnlyModelViewSet):
     def get_authenticators(self):
         if "enroll" in self.request.path or "enrolled" in self.request.path:
             return super().get_authenticators()
-        return [OptionalJWTAuthentication()]
+        return [OptionalClaimsJWTAuthentication()]
 
     def get_serializer_class(self):
         if self.action in ["list", "explore"]:
@@ -37,11 +42,88 @@ class CourseView(ReadOnlyModelViewSet):
     def get_queryset(self):
         queryset = super().get_queryset()
         technology = self.request.query_params.get("technology")
-        return CourseService.filter_courses_by_technology(queryset, technology)
+        queryset = CourseService.filter_courses_by_technology(queryset, technology)
+        queryset = CourseService.search_courses(
+            queryset, self.request.query_params.get("q")
+        )
+        return CourseService.optimize_for_serializer(
+            queryset, self.get_serializer_class()
+        )
 
     def get_object(self):
         lookup_value = self.kwargs.get(self.lookup_field)
-        return CourseService.get_published_course_by_lookup(lookup_value)
+        queryset = CourseService.optimize_for_serializer(
+            CourseService.get_courses(), self.get_serializer_class()
+        )
+        return CourseService.get_published_course_by_lookup(lookup_value, queryset)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in ["list", "retrieve"]:
+            # These payloads are cached for everyone, is_enrolled is overlaid per user
+            context["enrolled_course_ids"] = frozenset()
+        return context
+
+    def list(self, request, *args, **kwargs):
+        def build():
+            payload = CatalogueCache.get_or_build(
+                request,
+                lambda: super(CourseView, self).list(request, *args, **kwargs).data,
+            )
+            return Response(self.overlay_enrollment(payload))
+
+        return self.conditional_response(
+            request, build, etag=self.get_catalogue_etag(), per_user=True
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        def build():
+            payload = CatalogueCache.get_or_build(
+                request,
+                lambda: super(CourseView, self).retrieve(request, *args, **kwargs).data,
+            )
+            return Response(self.overlay_enrollment(payload))
+
+        return self.conditional_response(
+            request, build, etag=self.get_catalogue_etag(), per_user=True
+        )
+
+    def get_catalogue_etag(self) -> str:
+        etag = CatalogueCache.get_generation()
+        user = self.request.user
+        if user.is_authenticated:
+            # Enrollments leave the version alone, so is_enrolled needs its own part
+            etag = f"{etag}-{CourseService.get_enrollment_stamp(user)}"
+        return etag
+
+    def overlay_enrollment(self, payload):
+        user = self.request.user
+        if not user.is_authenticated:
+            return payload
+        if self.action == "retrieve":
+            # One probe of the (course, user) unique index
+            course_id = payload["id"]
+            enrolled = CourseService.is_user_enrolled(user, course_id)
+            return CatalogueCache.overlay_enrollment(
+                payload, {course_id} if enrolled else frozenset()
+            )
+        courses = payload["results"] if "results" in payload else payload
+        return CatalogueCache.overlay_enrollment(
+            payload,
+            CourseService.get_enrolled_course_ids(
+                user, [course["id"] for course in courses]
+            ),
+        )
+
+    @action(detail=True, methods=["get"], url_path="ratings")
+    def ratings(self, request, pk=None):
+        course = CourseService.get_published_course_by_lookup(pk)
+        paginator = RatingCursorPagination()
+        page = paginator.paginate_queryset(
+            CourseService.get_course_ratings(course), request, view=self
+        )
+        serializer = CourseRatingSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     @action(
         detail=False,
@@ -51,24 +133,27 @@ class CourseView(ReadOnlyModelViewSet):
     )
     def enrolled_courses(self, request):
         user = request.user
-        courses = CourseService.get_user_enrolled_courses(user)
-        page = self.paginate_queryset(courses)
-        if page is not None:
-            serializer = CourseOverviewSerializer(
-                page, many=True, context={"request": request}
-            )
-            return self.get_paginated_response(serializer.data)
-        serializer = CourseOverviewSerializer(
-            courses, many=True, context={"request": request}
+        courses = CourseService.optimize_for_serializer(
+            CourseService.get_user_enrolled_courses(user), EnrolledCourseSerializer
+        )
+        paginator = EnrollmentCursorPagination()
+        page = paginator.paginate_queryset(
+            courses,
+            request,
+            view=self,
+            count=CourseService.count_user_enrollments(user),
         )
-        return Response(serializer.data)
+        serializer = EnrolledCourseSerializer(
+            page, many=True, context={"request": request}
+        )
+        return paginator.get_paginated_response(serializer.data)
 
 
-class TechnologyView(ReadOnlyModelViewSet):
+class TechnologyView(ConditionalGetMixin, ReadOnlyModelViewSet):
     queryset = CourseTechnology.objects.all()
     serializer_class = CourseTechnologySerializer
     permission_classes = [permissions.AllowAny]
-    authentication_classes = [OptionalJWTAuthentication]
+    authentication_classes = [OptionalClaimsJWTAuthentication]
     pagination_class = None
 
     def get_object(self):
@@ -80,8 +165,25 @@ class TechnologyView(ReadOnlyModelViewSet):
         technology = self.request.query_params.get("sector")
         return CourseService.filter_technology_by_sector(queryset, technology)
 
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request,
+            lambda: super(TechnologyView, self).list(request, *args, **kwargs),
+            etag=CatalogueCache.get_generation(),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request,
+            lambda: super(TechnologyView, self).retrieve(request, *args, **kwargs),
+            etag=CatalogueCache.get_generation(),
+        )
+
     @action(detail=False, methods=["get"], url_path="explore")
     def explore(self, request):
-        technologies = CourseService.get_all_technologies()
-        serializer = ExploreTechnologySerializer(technologies, many=True)
-        return Response(serializer.data)
+        sector = request.query_params.get("sector")
+        return self.conditional_response(
+            request,
+            lambda: Response(explore_snapshot.get(sector)),
+            etag=CatalogueCache.get_generation(),
+        )
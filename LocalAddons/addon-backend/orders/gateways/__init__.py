@@ -0,0 +1,40 @@
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .base import GatewayError, PaymentGateway
+
+__all__ = ["GatewayError", "PaymentGateway", "get_gateway"]
+
+# Driver instances by gateway name, each imported and built on first use
+gateways: dict[str, PaymentGateway] = {}
+gateways_lock = threading.Lock()
+
+
+def get_gateway(name: str | None = None) -> PaymentGateway:
+    """Driver for ``name`` from PAYMENT_GATEWAYS, DEFAULT_PAYMENT_GATEWAY if None."""
+    name = name or settings.DEFAULT_PAYMENT_GATEWAY
+    gateway = gateways.get(name)
+    if gateway is None:
+        with gateways_lock:
+            gateway = gateways.get(name)
+            if gateway is None:
+                if name not in settings.PAYMENT_GATEWAYS:
+                    raise ImproperlyConfigured(f"Unknown payment gateway {name!r}")
+                options = dict(settings.PAYMENT_GATEWAYS[name])
+                driver = import_string(options.pop("payment_driver"))
+                gateway = gateways[name] = driver(name, options)
+    return gateway
+
+
+@receiver(setting_changed)
+def reset_gateways(*, setting, **kwargs):
+    if setting in ("PAYMENT_GATEWAYS", "DEFAULT_PAYMENT_GATEWAY"):
+        with gateways_lock:
+            for gateway in gateways.values():
+                gateway.close()
+            gateways.clear()
@@ -0,0 +1,96 @@
+import abc
+import threading
+from decimal import Decimal
+
+import requests as rq
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from backend.config import (
+    PAYMENT_GATEWAY_POOL_SIZE,
+    PAYMENT_GATEWAY_RETRIES,
+    PAYMENT_GATEWAY_TIMEOUT,
+)
+
+
+class GatewayError(Exception):
+    """The gateway could not be reached or rejected the request."""
+
+
+def to_subunits(amount) -> int:
+    """Rupees to paise, as gateways take amounts in the smallest unit."""
+    return int((Decimal(str(amount)) * 100).quantize(Decimal(1)))
+
+
+class PaymentGateway(abc.ABC):
+    """
+    Base payment driver, built once per process from its PAYMENT_GATEWAYS
+    entry. Gateway calls go through ``request``, over one keep-alive session
+    per driver with a timeout and retries for connection failures and 5xx
+    responses. Drivers implement ``create_checkout`` and ``fetch_status``.
+    """
+
+    base_url = ""
+
+    def __init__(self, name: str, options: dict) -> None:
+        self.name = name
+        self.options = options
+        self.base_url = options.get("api_url", self.base_url)
+        self.timeout = options.get("timeout", PAYMENT_GATEWAY_TIMEOUT)
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> rq.Session:
+        # Built on first use, so forked workers never share sockets
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self.build_session()
+        return self._session
+
+    def build_session(self) -> rq.Session:
+        retries = Retry(
+            total=self.options.get("retries", PAYMENT_GATEWAY_RETRIES),
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            # A POST is only retried when the connection failed before sending
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            raise_on_status=False,
+        )
+        session = rq.Session()
+        session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_maxsize=self.options.get("pool_size", PAYMENT_GATEWAY_POOL_SIZE),
+                max_retries=retries,
+            ),
+        )
+        return session
+
+    def request(self, method: str, path: str, **kwargs) -> dict:
+        try:
+            response = self.session.request(
+                method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs
+            )
+            response.raise_for_status()
+            return response.json()
+        except (rq.RequestException, ValueError) as e:
+            raise GatewayError(f"{self.name} {method} {path} failed") from e
+
+    def close(self) -> None:
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    @abc.abstractmethod
+    def create_checkout(self, order) -> dict:
+        """
+        Open a payment for ``order`` and return what the client needs to start
+        it. References the driver needs later go in ``order.payment_metadata``.
+        """
+
+    @abc.abstractmethod
+    def fetch_status(self, order) -> str:
+        """Ask the gateway for the order's status: PENDING, COMPLETED or FAILED."""
@@ -0,0 +1,50 @@
+from backend.config import FRONTEND_URL
+
+from .base import PaymentGateway
+
+CASHFREE_API_VERSION = "2023-08-01"
+
+CASHFREE_STATUSES = {"PAID": "COMPLETED", "EXPIRED": "FAILED", "TERMINATED": "FAILED"}
+
+
+class CashfreeGateway(PaymentGateway):
+    """Cashfree PG orders, keyed on our order id, paid through a payment session."""
+
+    def build_session(self):
+        session = super().build_session()
+        session.headers.update(
+            {
+                "x-client-id": self.options["client_id"],
+                "x-client-secret": self.options["client_secret"],
+                "x-api-version": CASHFREE_API_VERSION,
+            }
+        )
+        return session
+
+    def create_checkout(self, order) -> dict:
+        cashfree_order = self.request(
+            "POST",
+            "/orders",
+            json={
+                "order_id": order.gateway_order_id,
+                "order_amount": float(order.amount),
+                "order_currency": order.currency,
+                "customer_details": {
+                    "customer_id": str(order.user_id),
+                    "customer_email": order.user.email,
+                    "customer_phone": order.user.mobile,
+                },
+                "order_meta": {
+                    "return_url": f"{FRONTEND_URL}/dashboard/enrolled-courses"
+                },
+            },
+        )
+        return {
+            "gateway": self.name,
+            "order_id": cashfree_order["order_id"],
+            "payment_session_id": cashfree_order["payment_session_id"],
+        }
+
+    def fetch_status(self, order) -> str:
+        cashfree_order = self.request("GET", f"/orders/{order.gateway_order_id}")
+        return CASHFREE_STATUSES.get(cashfree_order["order_status"], "PENDING")
@@ -0,0 +1,29 @@
+import time
+
+from backend.config import FRONTEND_URL
+
+from .base import PaymentGateway
+
+
+class FakeGateway(PaymentGateway):
+    """
+    In-process stand-in for tests and benchmarks that never opens a connection.
+    Every call sleeps ``latency`` seconds to mimic a round trip, and orders
+    settle with ``status``.
+    """
+
+    def simulate_round_trip(self) -> None:
+        latency = self.options.get("latency", 0)
+        if latency:
+            time.sleep(latency)
+
+    def create_checkout(self, order) -> dict:
+        self.simulate_round_trip()
+        return {
+            "gateway": self.name,
+            "payment_url": f"{FRONTEND_URL}/checkout/fake/{order.gateway_order_id}",
+        }
+
+    def fetch_status(self, order) -> str:
+        self.simulate_round_trip()
+        return self.options.get("status", "COMPLETED")
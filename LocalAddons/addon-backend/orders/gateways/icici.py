@@ -0,0 +1,57 @@
+from backend.config import (
+    BACKEND_URL,
+    ICICI_AES_KEY,
+    ICICI_MERCHANT_ID,
+    ICICI_SUB_MERCHANT_ID,
+)
+from backend.utils import AESCrypto
+
+from .base import PaymentGateway
+
+icici_aes = AESCrypto(ICICI_AES_KEY)
+
+
+def build_payment_url(order_id: str, amount) -> str:
+    (
+        mandatory_fields,
+        optional_fields,
+        return_url,
+        reference_no,
+        sub_merchant_id,
+        transaction_amount,
+        payment_mode,
+    ) = icici_aes.encrypt_many(
+        [
+            f"{order_id}|{ICICI_SUB_MERCHANT_ID}|{amount}",
+            "UPIVPA",
+            f"{BACKEND_URL}/api/v1/payments/verify/",
+            order_id,
+            ICICI_SUB_MERCHANT_ID,
+            str(amount),
+            "9",
+        ]
+    )
+    return (
+        f"https://eazypay.icicibank.com/EazyPG?"
+        f"merchantid={ICICI_MERCHANT_ID}&"
+        f"mandatory fields={mandatory_fields}&"
+        f"optional fields={optional_fields}&"
+        f"returnurl={return_url}&"
+        f"Reference No={reference_no}&"
+        f"submerchantid={sub_merchant_id}&"
+        f"transaction amount={transaction_amount}&"
+        f"paymode={payment_mode}"
+    )
+
+
+class IciciGateway(PaymentGateway):
+    """
+    ICICI Eazypay. Checkout is a redirect to a URL of AES encrypted fields,
+    built locally, and the result arrives at PaymentVerifyView.
+    """
+
+    def create_checkout(self, order) -> dict:
+        return {"payment_url": build_payment_url(order.gateway_order_id, order.amount)}
+
+    def fetch_status(self, order) -> str:
+        return order.payment_status
@@ -0,0 +1,39 @@
+from .base import PaymentGateway, to_subunits
+
+RAZORPAY_API_URL = "https://api.razorpay.com/v1"
+
+
+class RazorpayGateway(PaymentGateway):
+    """Razorpay Orders API, the client completes payment with Razorpay Checkout."""
+
+    base_url = RAZORPAY_API_URL
+
+    def build_session(self):
+        session = super().build_session()
+        session.auth = (self.options["key_id"], self.options["key_secret"])
+        return session
+
+    def create_checkout(self, order) -> dict:
+        razorpay_order = self.request(
+            "POST",
+            "/orders",
+            json={
+                "amount": to_subunits(order.amount),
+                "currency": order.currency,
+                "receipt": order.gateway_order_id,
+            },
+        )
+        order.payment_metadata = {"razorpay_order_id": razorpay_order["id"]}
+        return {
+            "gateway": self.name,
+            "key_id": self.options["key_id"],
+            "order_id": razorpay_order["id"],
+            "amount": razorpay_order["amount"],
+            "currency": razorpay_order["currency"],
+        }
+
+    def fetch_status(self, order) -> str:
+        razorpay_order = self.request(
+            "GET", f"/orders/{order.payment_metadata['razorpay_order_id']}"
+        )
+        return "COMPLETED" if razorpay_order["status"] == "paid" else "PENDING"
@@ -0,0 +1,84 @@
+import os
+import socket
+import string
+import threading
+import time
+import zlib
+
+from django.conf import settings
+
+# Ids count milliseconds from here, 41 bits last until 2094
+ORDER_ID_EPOCH_MS = 1_735_689_600_000  # 2025-01-01T00:00:00Z
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+SEQUENCE_MASK = (1 << SEQUENCE_BITS) - 1
+
+# ASCII order, so fixed-width encodings sort like the numbers they encode
+BASE62_ALPHABET = string.digits + string.ascii_uppercase + string.ascii_lowercase
+ENCODED_WIDTH = 11  # ceil(64 / log2(62))
+
+
+def encode_base62(number: int, width: int = ENCODED_WIDTH) -> str:
+    chars = []
+    while number:
+        number, remainder = divmod(number, 62)
+        chars.append(BASE62_ALPHABET[remainder])
+    return "".join(reversed(chars)).rjust(width, BASE62_ALPHABET[0])
+
+
+class OrderIdGenerator:
+    """
+    Snowflake-style order ids generated without a database round trip: 41
+    bits of milliseconds, a 10-bit worker id and a 12-bit per-millisecond
+    sequence, base62 encoded to a fixed width so they sort by creation time.
+
+    ``worker_id`` of ``-1`` derives one from the host name and pid, which is
+    recomputed after a fork. Derived ids can collide between processes, which
+    ``PaymentService.create_order`` absorbs by retrying; guaranteed distinct
+    workers need ORDER_ID_WORKER_ID set per process.
+    """
+
+    def __init__(self, worker_id: int = -1, prefix: str = "ord_") -> None:
+        if not -1 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be -1 or 0-{MAX_WORKER_ID}")
+        self.prefix = prefix
+        self._configured_worker_id = worker_id
+        self._lock = threading.Lock()
+        self._pid = None
+        self._worker_id = 0
+        self._last_ms = -1
+        self._sequence = 0
+
+    def _derive_worker_id(self) -> int:
+        if self._configured_worker_id >= 0:
+            return self._configured_worker_id
+        seed = f"{socket.gethostname()}:{os.getpid()}".encode()
+        return zlib.crc32(seed) & MAX_WORKER_ID
+
+    def next_int(self) -> int:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._worker_id = self._derive_worker_id()
+            # Never move backwards, even if the wall clock is stepped back
+            now = max(time.time_ns() // 1_000_000, self._last_ms)
+            if now == self._last_ms:
+                self._sequence = (self._sequence + 1) & SEQUENCE_MASK
+                if self._sequence == 0:
+                    # This millisecond is used up, borrow the next one
+                    now += 1
+            else:
+                self._sequence = 0
+            self._last_ms = now
+            return (
+                (now - ORDER_ID_EPOCH_MS) << (WORKER_BITS + SEQUENCE_BITS)
+                | self._worker_id << SEQUENCE_BITS
+                | self._sequence
+            )
+
+    def next_id(self) -> str:
+        return self.prefix + encode_base62(self.next_int())
+
+
+order_id_generator = OrderIdGenerator(settings.ORDER_ID_WORKER_ID)
@@ -0,0 +1,150 @@
+import base64
+import statistics
+import time
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from accounts.models import User
+from backend.config import (
+    BACKEND_URL,
+    ICICI_AES_KEY,
+    ICICI_MERCHANT_ID,
+    ICICI_SUB_MERCHANT_ID,
+)
+from orders.gateways.icici import build_payment_url
+from orders.ids import order_id_generator
+from orders.services import PaymentService
+
+
+def legacy_encrypt(key, plain_text):
+    """A fresh cipher, encryptor and padder per field, as checkout used to."""
+    cipher = Cipher(algorithms.AES(key), modes.ECB(), backend=default_backend())
+    encryptor = cipher.encryptor()
+    padder = padding.PKCS7(128).padder()
+    padded_data = padder.update(plain_text.encode()) + padder.finalize()
+    encrypted = encryptor.update(padded_data) + encryptor.finalize()
+    return base64.b64encode(encrypted).decode("utf-8")
+
+
+def legacy_payment_url(order_id, amount):
+    key = ICICI_AES_KEY.encode()
+    fields = [
+        legacy_encrypt(key, plain_text)
+        for plain_text in (
+            f"{order_id}|{ICICI_SUB_MERCHANT_ID}|{amount}",
+            "UPIVPA",
+            f"{BACKEND_URL}/api/v1/payments/verify/",
+            order_id,
+            ICICI_SUB_MERCHANT_ID,
+            str(amount),
+            "9",
+        )
+    ]
+    return (
+        f"https://eazypay.icicibank.com/EazyPG?"
+        f"merchantid={ICICI_MERCHANT_ID}&"
+        f"mandatory fields={fields[0]}&"
+        f"optional fields={fields[1]}&"
+        f"returnurl={fields[2]}&"
+        f"Reference No={fields[3]}&"
+        f"submerchantid={fields[4]}&"
+        f"transaction amount={fields[5]}&"
+        f"paymode={fields[6]}"
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure checkout payment URL generation per second with a cipher per "
+        "field against the cached, batched AESCrypto, then whole checkouts "
+        "through the in-process fake gateway in a rolled back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--urls", type=int, default=20_000)
+        parser.add_argument("--rounds", type=int, default=5)
+        parser.add_argument("--orders", type=int, default=2000)
+        parser.add_argument("--products", type=int, default=3)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.0,
+            help="Seconds the fake gateway sleeps per call",
+        )
+
+    def handle(self, *args, **options):
+        if len(ICICI_AES_KEY.encode()) not in (16, 24, 32):
+            self.stderr.write(
+                "ICICI_AES_KEY is not a 16, 24 or 32 byte key, skipping URL generation."
+            )
+        else:
+            self.bench_urls(options["urls"], options["rounds"])
+        self.bench_checkout(options["orders"], options["products"], options["latency"])
+
+    def bench_urls(self, count, rounds):
+        order_ids = [order_id_generator.next_id() for _ in range(count)]
+        if legacy_payment_url(order_ids[0], 499) != build_payment_url(
+            order_ids[0], 499
+        ):
+            self.stderr.write("Payment URLs differ between implementations.")
+            return
+        for label, build in (
+            ("before (cipher per field)", legacy_payment_url),
+            ("after (cached, batched)", build_payment_url),
+        ):
+            self.report(label, self.measure(build, order_ids, rounds))
+
+    def bench_checkout(self, count, product_count, latency):
+        gateways = {
+            **settings.PAYMENT_GATEWAYS,
+            "fake": {
+                "payment_driver": "orders.gateways.fake.FakeGateway",
+                "latency": latency,
+            },
+        }
+        products = [
+            {
+                "product_category": "course",
+                "product_key": str(index),
+                "product_name": f"bench course {index}",
+                "quantity": 1,
+                "unit_price": 499.0,
+            }
+            for index in range(product_count)
+        ]
+        with override_settings(PAYMENT_GATEWAYS=gateways), transaction.atomic():
+            user = User.objects.create(
+                username="bench_checkout",
+                email="bench_checkout@example.com",
+                mobile="0000000000",
+            )
+            started = time.perf_counter()
+            for _ in range(count):
+                PaymentService.create_order(user, products, True, gateway="fake")
+            elapsed = time.perf_counter() - started
+            transaction.set_rollback(True)
+        self.stdout.write(
+            f"checkout via fake gateway ({latency * 1000:.0f}ms round trip): "
+            f"{count / elapsed:,.0f} orders/s"
+        )
+
+    def measure(self, build, order_ids, rounds):
+        rates = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            for order_id in order_ids:
+                build(order_id, 499)
+            rates.append(len(order_ids) / (time.perf_counter() - started))
+        return rates
+
+    def report(self, label, rates):
+        self.stdout.write(
+            f"{label}: median {statistics.median(rates):,.0f} URLs/s, "
+            f"best {max(rates):,.0f} URLs/s"
+        )
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.6 on 2026-10-17 21:49
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def clear_blank_order_ids(apps, schema_editor):
+    # Blank ids would collide under the unique index, NULLs do not
+    OrderTable = apps.get_model("orders", "OrderTable")
+    OrderTable.objects.filter(gateway_order_id="").update(gateway_order_id=None)
+
+
+def dedupe_order_ids(apps, schema_editor):
+    """Keep the earliest order per gateway_order_id, suffix the others' ids."""
+    OrderTable = apps.get_model("orders", "OrderTable")
+    duplicates = (
+        OrderTable.objects.exclude(gateway_order_id=None)
+        .values("gateway_order_id")
+        .annotate(first_id=Min("id"), total=Count("id"))
+        .filter(total__gt=1)
+    )
+    renamed = []
+    for row in duplicates.iterator():
+        for order in OrderTable.objects.filter(
+            gateway_order_id=row["gateway_order_id"]
+        ).exclude(pk=row["first_id"]):
+            # Orders are payment records, so they are renamed rather than deleted
+            suffix = f"-dup{order.pk}"
+            order.gateway_order_id = (
+                order.gateway_order_id[: 100 - len(suffix)] + suffix
+            )
+            renamed.append(order)
+    OrderTable.objects.bulk_update(renamed, ["gateway_order_id"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0003_remove_ordertable_address_remove_ordertable_email_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_blank_order_ids, migrations.RunPython.noop),
+        migrations.RunPython(dedupe_order_ids, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="ordertable",
+            name="gateway_order_id",
+            field=models.CharField(
+                blank=True,
+                help_text="Order ID for the payment, can be used to track the payment",
+                max_length=100,
+                null=True,
+                unique=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="ordertable",
+            name="gateway_payment_id",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                help_text="Payment ID for the transaction, can be used to verify the payment",
+                max_length=100,
+                null=True,
+            ),
+        ),
+    ]
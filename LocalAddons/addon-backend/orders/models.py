@@ -30,12 +30,14 @@ class OrderTable(models.Model):
         max_length=100,
         blank=True,
         null=True,
+        unique=True,
         help_text="Order ID for the payment, can be used to track the payment",
     )
     gateway_payment_id = models.CharField(
         max_length=100,
         blank=True,
         null=True,
+        db_index=True,
         help_text="Payment ID for the transaction, can be used to verify the payment",
     )
     ordered_products = models.JSONField(
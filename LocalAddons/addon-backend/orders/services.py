@@ -1,24 +1,28 @@
 import hashlib
-import secrets
-import string
 from typing import Union
 from urllib.parse import unquote_plus
 
-from django.db.models import Q
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from rest_framework.request import Request
 
 from accounts.models import User
-from backend.config import (
-    BACKEND_URL,
-    FRONTEND_URL,
-    ICICI_AES_KEY,
-    ICICI_MERCHANT_ID,
-    ICICI_SUB_MERCHANT_ID,
-)
-from backend.utils import AESCrypto
+from backend.config import FRONTEND_URL, ICICI_AES_KEY
+from course.services import CourseService
 
+from .gateways import GatewayError, get_gateway
+from .ids import order_id_generator
 from .models import Cart, CartItem, OrderTable
 
+PAYMENT_CALLBACK_CACHE_PREFIX = "orders:callback:"
+
+# Statuses a callback can no longer change
+FINAL_PAYMENT_STATUSES = ("COMPLETED", "FAILED")
+
+# Fresh order ids tried before a collision on gateway_order_id is an error
+ORDER_ID_ATTEMPTS = 3
+
 
 class CartService:
     @staticmethod
@@ -71,64 +75,121 @@ class CartService:
         CartItem.objects.filter(cart=cart).delete()
 
 
+class FulfilmentService:
+    @staticmethod
+    def get_ordered_course_ids(order: OrderTable) -> list[int]:
+        products = (order.ordered_products or {}).get("products", [])
+        return [
+            int(product["product_key"])
+            for product in products
+            if product.get("product_category") == "course"
+        ]
+
+    @staticmethod
+    def fulfil_order(order: OrderTable) -> set[int]:
+        """
+        Enroll the buyer in every course recorded on the order and drop those
+        courses from their cart, in one transaction. Callers hold the order's
+        row lock. Returns the newly enrolled course ids.
+        """
+        course_ids = FulfilmentService.get_ordered_course_ids(order)
+        with transaction.atomic():
+            enrolled = CourseService.enroll_user_in_courses(order.user, course_ids)
+            if (order.ordered_products or {}).get("is_cart_payment"):
+                CartItem.objects.filter(
+                    cart__user_id=order.user_id, product_id__in=course_ids
+                ).delete()
+        return enrolled
+
+
 class PaymentService:
     @staticmethod
     def generate_unique_order_id(user: Union[User, None] = None) -> str:
-        while True:
-            characters = string.ascii_letters + string.digits
-            order_id = "ord_" + "".join(secrets.choice(characters) for _ in range(10))
-            if not OrderTable.objects.filter(gateway_order_id=order_id).exists():
-                return order_id
+        # Unique by construction, the unique index on gateway_order_id backs it up
+        return order_id_generator.next_id()
 
     @staticmethod
     def create_order(
         user: User,
         products: list,
         is_cart_payment: bool = False,
+        gateway: Union[str, None] = None,
     ) -> dict:
-        order_id = PaymentService.generate_unique_order_id()
+        gateway = get_gateway(gateway)
         products_price = 0
         for product in products:
             products_price += product["unit_price"]
-        order = OrderTable.objects.create(
-            user=user,
-            gateway_order_id=order_id,
-            ordered_products={
-                "products": products,
-                "is_cart_payment": is_cart_payment,
-            },
-            payment_gateway="icici",
-            amount=products_price,
-        )
-        aes = AESCrypto(ICICI_AES_KEY)
+        for attempt in range(ORDER_ID_ATTEMPTS):
+            order_id = PaymentService.generate_unique_order_id()
+            try:
+                with transaction.atomic():
+                    order = OrderTable.objects.create(
+                        user=user,
+                        gateway_order_id=order_id,
+                        ordered_products={
+                            "products": products,
+                            "is_cart_payment": is_cart_payment,
+                        },
+                        payment_gateway=gateway.name,
+                        amount=products_price,
+                    )
+                break
+            except IntegrityError:
+                # Derived worker ids can collide, the unique index catches it
+                is_taken = OrderTable.objects.filter(gateway_order_id=order_id).exists()
+                if not is_taken or attempt == ORDER_ID_ATTEMPTS - 1:
+                    raise
+        checkout = gateway.create_checkout(order)
+        if order.payment_metadata:
+            order.save(update_fields=["payment_metadata"])
+        return {**checkout, "reference_id": order_id}
 
-        mandatory_fields = aes.encrypt_using_aes(
-            f"{order_id}|{ICICI_SUB_MERCHANT_ID}|{products_price}"
-        )
-        optional_fields = aes.encrypt_using_aes("UPIVPA")
-        return_url = aes.encrypt_using_aes(f"{BACKEND_URL}/api/v1/payments/verify/")
-        reference_no = aes.encrypt_using_aes(order_id)
-        sub_merchant_id = aes.encrypt_using_aes(ICICI_SUB_MERCHANT_ID)
-        transaction_amount = aes.encrypt_using_aes(str(products_price))
-        payment_mode = aes.encrypt_using_aes("9")
-        payment_url = (
-            f"https://eazypay.icicibank.com/EazyPG?"
-            f"merchantid={ICICI_MERCHANT_ID}&"
-            f"mandatory fields={mandatory_fields}&"
-            f"optional fields={optional_fields}&"
-            f"returnurl={return_url}&"
-            f"Reference No={reference_no}&"
-            f"submerchantid={sub_merchant_id}&"
-            f"transaction amount={transaction_amount}&"
-            f"paymode={payment_mode}"
-        )
+    @staticmethod
+    def get_callback_status(order_id: str) -> Union[str, None]:
+        """
+        Status of the order behind a gateway callback, from the cache once it
+        is final and otherwise from one read on the gateway_order_id index.
+        """
+        key = f"{PAYMENT_CALLBACK_CACHE_PREFIX}{order_id}"
+        status = cache.get(key)
+        if status is None:
+            status = (
+                OrderTable.objects.filter(gateway_order_id=order_id)
+                .values_list("payment_status", flat=True)
+                .first()
+            )
+            if status in FINAL_PAYMENT_STATUSES:
+                cache.set(key, status, settings.PAYMENT_CALLBACK_CACHE_TIMEOUT)
+        return status
 
-        return {"payment_url": payment_url, "reference_id": order_id}
+    @staticmethod
+    def process_callback(order_id: str, payment_status: str, **fields) -> str:
+        """
+        Move a PENDING order to ``payment_status`` and fulfil it, under a row
+        lock so concurrent duplicate callbacks apply it once. Returns the status
+        the order ends up in.
+        """
+        with transaction.atomic():
+            payment = OrderTable.objects.select_for_update().get(
+                gateway_order_id=order_id
+            )
+            if payment.payment_status == "PENDING":
+                payment.payment_status = payment_status
+                for field, value in fields.items():
+                    setattr(payment, field, value)
+                payment.save()
+                if payment_status == "COMPLETED":
+                    FulfilmentService.fulfil_order(payment)
+        cache.set(
+            f"{PAYMENT_CALLBACK_CACHE_PREFIX}{order_id}",
+            payment.payment_status,
+            settings.PAYMENT_CALLBACK_CACHE_TIMEOUT,
+        )
+        return payment.payment_status
 
     @staticmethod
     def verify_payment(request: Request) -> dict:
         body_text = request.body.decode("utf-8") if hasattr(request, "body") else ""
-        print("ICICI Payment Gateway Response:", body_text)
         body_text = body_text.replace("+", " ")
         parsed_data = {}
         for pair in body_text.split("&"):
@@ -147,26 +208,33 @@ class PaymentService:
                 "redirect_url": f"{FRONTEND_URL}/dashboard",
             }
 
-        try:
-            payment = OrderTable.objects.get(gateway_order_id=order_id)
-            payment.payment_status = payment_status
-            payment.gateway_payment_id = transaction_id
-            payment.payment_metadata = parsed_data
-            payment.save()
+        status = PaymentService.get_callback_status(order_id)
+        if status is None:
             return {
-                "status": "VERIFIED",
-                "user": payment.user,
-                "payment_status": payment_status,
-                "order_id": order_id,
-                "transaction_id": transaction_id,
-                "redirect_url": f"{FRONTEND_URL}/dashboard/enrolled-courses",
+                "status": "error",
+                "message": "Payment processing failed",
+                "redirect_url": f"{FRONTEND_URL}/cart?error=failed",
             }
-        except Exception as e:
+        if status == "PENDING":
+            status = PaymentService.process_callback(
+                order_id,
+                payment_status,
+                gateway_payment_id=transaction_id,
+                payment_metadata=parsed_data,
+            )
+        if status != "COMPLETED":
             return {
                 "status": "error",
-                "message": "Payment processing failed",
+                "message": "Payment failed",
                 "redirect_url": f"{FRONTEND_URL}/cart?error=failed",
             }
+        return {
+            "status": "VERIFIED",
+            "payment_status": status,
+            "order_id": order_id,
+            "transaction_id": transaction_id,
+            "redirect_url": f"{FRONTEND_URL}/dashboard/enrolled-courses",
+        }
 
     @staticmethod
     def verify_signature(res: dict) -> bool:
@@ -200,11 +268,25 @@ class PaymentService:
 
     @staticmethod
     def get_payment_status(order_id: str) -> dict:
-        payment = OrderTable.objects.get(
-            Q(gateway_order_id=order_id) | Q(gateway_payment_id=order_id)
-        )
+        # Two index probes rather than one OR across both columns
+        payment = OrderTable.objects.filter(gateway_order_id=order_id).first()
+        if payment is None:
+            payment = OrderTable.objects.get(gateway_payment_id=order_id)
+        payment_status = payment.payment_status
+        if payment_status == "PENDING":
+            # The gateway may have settled it without a callback reaching us
+            try:
+                gateway_status = get_gateway(payment.payment_gateway).fetch_status(
+                    payment
+                )
+            except GatewayError:
+                gateway_status = None
+            if gateway_status in FINAL_PAYMENT_STATUSES:
+                payment_status = PaymentService.process_callback(
+                    payment.gateway_order_id, gateway_status
+                )
         return {
-            "payment_status": payment.payment_status.upper(),
+            "payment_status": payment_status.upper(),
             "gateway_order_id": payment.gateway_order_id,
             "payment_gateway": payment.payment_gateway,
         }
@@ -1,3 +1,314 @@
-from django.test import TestCase
+import base64
+import hashlib
+from unittest import mock
+from urllib.parse import urlencode
 
-# Create your tests here.
+import requests as rq
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from accounts.models import User
+from backend.config import ICICI_AES_KEY
+from backend.utils import AESCrypto
+from course.models import CourseEnrollment, CourseInstructor, CourseTechnology
+from course.tests import create_course
+
+from .gateways import GatewayError, PaymentGateway, get_gateway
+from .gateways.fake import FakeGateway
+from .ids import SEQUENCE_MASK, OrderIdGenerator
+from .management.commands.bench_checkout import legacy_encrypt
+from .models import Cart, CartItem, OrderTable
+from .services import FulfilmentService, PaymentService
+
+
+class OrderIdGeneratorTests(SimpleTestCase):
+    def test_ids_are_unique_and_sort_by_creation(self):
+        generator = OrderIdGenerator(worker_id=7)
+        ids = [generator.next_id() for _ in range(10_000)]
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual(ids, sorted(ids))
+        self.assertTrue(all(len(order_id) == 15 for order_id in ids))
+
+    def test_exhausted_millisecond_and_clock_step_back_stay_ordered(self):
+        generator = OrderIdGenerator(worker_id=1)
+        with mock.patch("orders.ids.time.time_ns", return_value=1_800_000_000 * 10**9):
+            first = [generator.next_int() for _ in range(SEQUENCE_MASK + 2)]
+        with mock.patch("orders.ids.time.time_ns", return_value=1_700_000_000 * 10**9):
+            first.append(generator.next_int())
+        self.assertEqual(first, sorted(set(first)))
+
+    def test_workers_in_the_same_millisecond_get_distinct_ids(self):
+        with mock.patch("orders.ids.time.time_ns", return_value=1_800_000_000 * 10**9):
+            ids = {OrderIdGenerator(worker_id=worker).next_int() for worker in range(8)}
+        self.assertEqual(len(ids), 8)
+
+
+class AESCryptoTests(SimpleTestCase):
+    KEY = "0123456789abcdef"
+
+    def test_batched_fields_match_a_cipher_per_field(self):
+        aes = AESCrypto(self.KEY)
+        fields = ["", "9", "UPIVPA", "0123456789abcdef", "ord_1|42|499.00" * 5]
+        expected = [legacy_encrypt(self.KEY.encode(), field) for field in fields]
+        self.assertEqual(aes.encrypt_many(fields), expected)
+        self.assertEqual(aes.encrypt_many(fields), expected)
+        self.assertEqual(
+            [aes.decrypt_using_aes(encrypted) for encrypted in expected], fields
+        )
+
+    def test_truncated_ciphertext_leaves_the_cipher_usable(self):
+        aes = AESCrypto(self.KEY)
+        encrypted = aes.encrypt_using_aes("UPIVPA")
+        with self.assertRaises(ValueError):
+            aes.decrypt_using_aes(base64.b64encode(b"short").decode())
+        self.assertEqual(aes.decrypt_using_aes(encrypted), "UPIVPA")
+
+
+class FulfilmentTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        instructor = CourseInstructor.objects.create(name="Instructor")
+        technology = CourseTechnology.objects.create(
+            slug="python", name="Python", sector="IT"
+        )
+        cls.courses = [create_course(i, instructor, technology) for i in range(6)]
+        cls.user = User.objects.create(
+            username="buyer", email="buyer@example.com", mobile="9000000000"
+        )
+
+    def create_order(self, courses):
+        return OrderTable.objects.create(
+            user=self.user,
+            ordered_products={
+                "products": [
+                    {"product_category": "course", "product_key": str(course.pk)}
+                    for course in courses
+                ],
+                "is_cart_payment": True,
+            },
+            payment_gateway="ICICI",
+        )
+
+    def test_fulfilment_enrolls_ordered_courses_and_keeps_later_cart_items(self):
+        CourseEnrollment.objects.create(course=self.courses[0], user=self.user)
+        cart = Cart.objects.create(user=self.user)
+        for course in self.courses[:3]:
+            CartItem.objects.create(cart=cart, product=course)
+        order = self.create_order(self.courses[:2])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            enrolled = FulfilmentService.fulfil_order(order)
+
+        self.assertEqual(enrolled, {self.courses[1].pk})
+        self.assertEqual(
+            list(cart.cartitem_set.values_list("product_id", flat=True)),
+            [self.courses[2].pk],
+        )
+        for course, count in zip(self.courses[:3], (1, 1, 0)):
+            course.refresh_from_db()
+            self.assertEqual(course.student_count, count)
+
+        FulfilmentService.fulfil_order(order)
+        self.courses[1].refresh_from_db()
+        self.assertEqual(self.courses[1].student_count, 1)
+
+    def test_query_count_does_not_grow_with_the_order(self):
+        small, large = self.create_order(self.courses[:1]), self.create_order(
+            self.courses[1:]
+        )
+        with self.assertNumQueries(9) as small_queries:
+            FulfilmentService.fulfil_order(small)
+        with self.assertNumQueries(len(small_queries)):
+            FulfilmentService.fulfil_order(large)
+        self.assertEqual(
+            CourseEnrollment.objects.filter(user=self.user).count(), len(self.courses)
+        )
+
+
+class PaymentCallbackTests(TestCase):
+    SIGNED_FIELDS = (
+        "ID",
+        "Response Code",
+        "Unique Ref Number",
+        "Service Tax Amount",
+        "Processing Fee Amount",
+        "Total Amount",
+        "Transaction Amount",
+        "Transaction Date",
+        "Interchange Value",
+        "TDR",
+        "Payment Mode",
+        "SubMerchantId",
+        "ReferenceNo",
+        "TPS",
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        instructor = CourseInstructor.objects.create(name="Instructor")
+        technology = CourseTechnology.objects.create(
+            slug="python", name="Python", sector="IT"
+        )
+        cls.course = create_course(0, instructor, technology)
+        cls.user = User.objects.create(
+            username="buyer", email="buyer@example.com", mobile="9000000000"
+        )
+        cls.order = OrderTable.objects.create(
+            user=cls.user,
+            gateway_order_id="ord_callback",
+            ordered_products={
+                "products": [
+                    {"product_category": "course", "product_key": str(cls.course.pk)}
+                ],
+                "is_cart_payment": False,
+            },
+            payment_gateway="icici",
+            amount=100,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def callback(self):
+        data = {
+            "Response Code": "E000",
+            "Unique Ref Number": "UTR123",
+            "Total Amount": "100",
+            "Transaction Amount": "100",
+            "mandatory fields": f"{self.order.gateway_order_id}|1|100",
+        }
+        data["RS"] = hashlib.sha512(
+            "|".join(
+                [*(data.get(field, "") for field in self.SIGNED_FIELDS), ICICI_AES_KEY]
+            ).encode()
+        ).hexdigest()
+        request = RequestFactory().post(
+            "/api/v1/payments/verify/",
+            urlencode(data),
+            content_type="application/x-www-form-urlencoded",
+        )
+        return PaymentService.verify_payment(request)
+
+    def test_duplicate_callbacks_fulfil_the_order_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.callback()["status"], "VERIFIED")
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.payment_status, "COMPLETED")
+        self.assertEqual(self.order.gateway_payment_id, "UTR123")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.callback()["status"], "VERIFIED")
+        cache.clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.callback()["status"], "VERIFIED")
+
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.student_count, 1)
+        self.assertEqual(CourseEnrollment.objects.filter(user=self.user).count(), 1)
+
+    def test_callback_for_unknown_order_fails(self):
+        self.order.gateway_order_id = "ord_missing"
+        self.assertEqual(self.callback()["status"], "error")
+
+
+@override_settings(
+    PAYMENT_GATEWAYS={
+        "fake": {"payment_driver": "orders.gateways.fake.FakeGateway"},
+        "razorpay": {
+            "payment_driver": "orders.gateways.razorpay.RazorpayGateway",
+            "key_id": "rzp_test",
+            "key_secret": "secret",
+            "retries": 3,
+        },
+    },
+    DEFAULT_PAYMENT_GATEWAY="fake",
+)
+class PaymentGatewayTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            username="buyer", email="buyer@example.com", mobile="9000000000"
+        )
+        cls.products = [
+            {
+                "product_category": "course",
+                "product_key": "1",
+                "product_name": "Course",
+                "quantity": 1,
+                "unit_price": 499.5,
+            }
+        ]
+
+    def test_driver_missing_a_gateway_call_cannot_be_built(self):
+        class CheckoutOnly(PaymentGateway):
+            def create_checkout(self, order):
+                return {}
+
+        with self.assertRaises(TypeError):
+            CheckoutOnly("partial", {})
+
+    def test_pending_order_is_settled_from_the_gateway(self):
+        response = PaymentService.create_order(self.user, self.products)
+        status = PaymentService.get_payment_status(response["reference_id"])
+        self.assertEqual(status["payment_status"], "COMPLETED")
+        order = OrderTable.objects.get(gateway_order_id=response["reference_id"])
+        self.assertEqual(order.payment_status, "COMPLETED")
+
+    def test_drivers_are_resolved_once_from_settings(self):
+        gateway = get_gateway()
+        self.assertIsInstance(gateway, FakeGateway)
+        self.assertIs(get_gateway("fake"), gateway)
+        with self.assertRaises(ImproperlyConfigured):
+            get_gateway("icici")
+
+    def test_checkout_goes_through_the_default_driver(self):
+        response = PaymentService.create_order(self.user, self.products, True)
+        order = OrderTable.objects.get(gateway_order_id=response["reference_id"])
+        self.assertEqual(order.payment_gateway, "fake")
+        self.assertTrue(response["payment_url"].endswith(order.gateway_order_id))
+
+    def test_colliding_order_id_is_replaced(self):
+        OrderTable.objects.create(
+            user=self.user, gateway_order_id="ord_taken", amount=1
+        )
+        with mock.patch.object(
+            PaymentService,
+            "generate_unique_order_id",
+            side_effect=["ord_taken", "ord_fresh"],
+        ):
+            response = PaymentService.create_order(self.user, self.products)
+        self.assertEqual(response["reference_id"], "ord_fresh")
+        self.assertEqual(OrderTable.objects.filter(user=self.user).count(), 2)
+
+    def test_razorpay_order_is_created_over_the_pooled_session(self):
+        gateway = get_gateway("razorpay")
+        adapter = gateway.session.get_adapter("https://api.razorpay.com/v1/orders")
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertEqual(gateway.session.auth, ("rzp_test", "secret"))
+
+        reply = mock.Mock()
+        reply.json.return_value = {
+            "id": "order_rzp1",
+            "amount": 49950,
+            "currency": "INR",
+            "status": "created",
+        }
+        with mock.patch.object(gateway.session, "request", return_value=reply) as call:
+            response = PaymentService.create_order(
+                self.user, self.products, gateway="razorpay"
+            )
+        self.assertEqual(call.call_args.kwargs["json"]["amount"], 49950)
+        self.assertEqual(call.call_args.kwargs["timeout"], gateway.timeout)
+        self.assertEqual(response["order_id"], "order_rzp1")
+        order = OrderTable.objects.get(gateway_order_id=response["reference_id"])
+        self.assertEqual(order.payment_metadata, {"razorpay_order_id": "order_rzp1"})
+
+        with mock.patch.object(
+            gateway.session, "request", side_effect=rq.ConnectionError
+        ):
+            with self.assertRaises(GatewayError):
+                gateway.fetch_status(order)
+            # An unreachable gateway leaves the order pending
+            status = PaymentService.get_payment_status(response["reference_id"])
+        self.assertEqual(status["payment_status"], "PENDING")
@@ -11,6 +11,7 @@ from backend.config import FRONTEND_URL
 from course.models import Course
 from course.services import CourseService
 
+from .gateways import GatewayError
 from .serializers import AddToCartSerializer, CartSerializer
 from .services import CartService, PaymentService
 
@@ -18,10 +19,13 @@ from .services import CartService, PaymentService
 class CartViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
 
+    def serialize_cart(self, cart):
+        CourseService.prefetch_for_serializer([cart], CartSerializer)
+        return CartSerializer(cart, context={"request": self.request}).data
+
     def list(self, request):
         cart = CartService.get_or_create_cart(request.user)
-        serializer = CartSerializer(cart)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(self.serialize_cart(cart), status=status.HTTP_200_OK)
 
     @action(detail=False, methods=["post"])
     def add(self, request):
@@ -34,8 +38,7 @@ class CartViewSet(viewsets.ViewSet):
         cart = CartService.get_or_create_cart(request.user)
         CartService.add_item_to_cart(cart, product)
 
-        cart_serializer = CartSerializer(cart)
-        return Response(cart_serializer.data, status=status.HTTP_201_CREATED)
+        return Response(self.serialize_cart(cart), status=status.HTTP_201_CREATED)
 
     @action(detail=False, methods=["delete"])
     def remove(self, request):
@@ -54,17 +57,15 @@ class CartViewSet(viewsets.ViewSet):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        cart_serializer = CartSerializer(cart)
-        return Response(cart_serializer.data, status=status.HTTP_200_OK)
+        return Response(self.serialize_cart(cart), status=status.HTTP_200_OK)
 
     @action(detail=False, methods=["delete"])
     def clear(self, request):
         cart = CartService.get_or_create_cart(request.user)
         CartService.clear_cart(cart)
 
-        cart_serializer = CartSerializer(cart)
         return Response(
-            {"detail": "Cart cleared successfully", "cart": cart_serializer.data},
+            {"detail": "Cart cleared successfully", "cart": self.serialize_cart(cart)},
             status=status.HTTP_200_OK,
         )
 
@@ -93,7 +94,13 @@ class CartViewSet(viewsets.ViewSet):
             }
             for item in cart_items
         ]
-        response = PaymentService.create_order(request.user, products, True)
+        try:
+            response = PaymentService.create_order(request.user, products, True)
+        except GatewayError:
+            return Response(
+                {"detail": "Payment gateway unavailable, please try again"},
+                status=status.HTTP_502_BAD_GATEWAY,
+            )
         return Response(
             response,
             status=status.HTTP_200_OK,
@@ -109,10 +116,4 @@ class PaymentVerifyView(APIView):
 
     def post(self, request: Request):
         response = PaymentService.verify_payment(request)
-        if response.get("status") == "VERIFIED":
-            user = response.get("user")
-            cart = CartService.get_or_create_cart(user)
-            for course in cart.cartitem_set.all():
-                CourseService.enroll_user_in_course(user, course.product)
-            CartService.clear_cart(cart)
         return redirect(response.get("redirect_url"))
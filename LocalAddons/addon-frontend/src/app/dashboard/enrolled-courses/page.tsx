@@ -12,14 +12,15 @@ const MyCourses = () => {
 	const { enrolledWorkshops, enrolledWorkshopsLoading, enrolledWorkshopsError, enrolledWorkshopsPagination, fetchEnrolledWorkshops } = useWorkshopStore();
 
 	useEffect(() => {
-		fetchEnrolledWorkshops(currentPage);
-	}, [fetchEnrolledWorkshops, currentPage]);
+		fetchEnrolledWorkshops();
+	}, [fetchEnrolledWorkshops]);
 
 	const handleSearchChange = useCallback((e: React.ChangeEvent<HTMLInputElement>) => {
 		setSearchTerm(e.target.value);
 	}, []);
 
 	const handleRetryFetch = useCallback(() => {
+		setCurrentPage(1);
 		fetchEnrolledWorkshops();
 	}, [fetchEnrolledWorkshops]);
 
@@ -28,12 +29,16 @@ const MyCourses = () => {
 	}, []);
 
 	const handlePreviousPage = useCallback(() => {
+		if (!enrolledWorkshopsPagination?.previous) return;
 		setCurrentPage((prev) => Math.max(1, prev - 1));
-	}, []);
+		fetchEnrolledWorkshops(enrolledWorkshopsPagination.previous);
+	}, [enrolledWorkshopsPagination, fetchEnrolledWorkshops]);
 
 	const handleNextPage = useCallback(() => {
+		if (!enrolledWorkshopsPagination?.next) return;
 		setCurrentPage((prev) => prev + 1);
-	}, []);
+		fetchEnrolledWorkshops(enrolledWorkshopsPagination.next);
+	}, [enrolledWorkshopsPagination, fetchEnrolledWorkshops]);
 
 	const getLevelColor = useCallback((level: string) => {
 		switch (level) {
@@ -96,11 +96,19 @@ const EnrolledCoursesSection = () => {
 	const [currentPage, setCurrentPage] = useState(1);
 
 	useEffect(() => {
-		fetchEnrolledWorkshops(currentPage);
-	}, [fetchEnrolledWorkshops, currentPage]);
-
-	const handlePreviousPage = useCallback(() => setCurrentPage((p) => Math.max(1, p - 1)), []);
-	const handleNextPage = useCallback(() => setCurrentPage((p) => p + 1), []);
+		fetchEnrolledWorkshops();
+	}, [fetchEnrolledWorkshops]);
+
+	const handlePreviousPage = useCallback(() => {
+		if (!enrolledWorkshopsPagination?.previous) return;
+		setCurrentPage((p) => Math.max(1, p - 1));
+		fetchEnrolledWorkshops(enrolledWorkshopsPagination.previous);
+	}, [enrolledWorkshopsPagination, fetchEnrolledWorkshops]);
+	const handleNextPage = useCallback(() => {
+		if (!enrolledWorkshopsPagination?.next) return;
+		setCurrentPage((p) => p + 1);
+		fetchEnrolledWorkshops(enrolledWorkshopsPagination.next);
+	}, [enrolledWorkshopsPagination, fetchEnrolledWorkshops]);
 
 	const renderContent = () => {
 		if (enrolledWorkshopsLoading) {
@@ -132,7 +132,7 @@ interface WorkshopState {
 	// Actions
 	fetchWorkshops: (technology?: string, page?: number) => Promise<void>;
 	fetchTechnologies: () => Promise<void>;
-	fetchEnrolledWorkshops: (page?: number) => Promise<void>;
+	fetchEnrolledWorkshops: (pageUrl?: string | null) => Promise<void>;
 	fetchWorkshopBySlug: (slug: string) => Promise<void>;
 	enrollInWorkshop: (workshopId: number) => Promise<void>;
 	unenrollFromWorkshop: (workshopId: number) => Promise<void>;
@@ -302,20 +302,12 @@ export const useWorkshopStore = create<WorkshopState>((set, get) => ({
 		}
 	},
 
-	fetchEnrolledWorkshops: async (page?: number) => {
+	fetchEnrolledWorkshops: async (pageUrl?: string | null) => {
 		set({ enrolledWorkshopsLoading: true, enrolledWorkshopsError: null });
 		try {
 			const { token } = useAuthStore.getState();
-			let url = `${WORKSHOP_ENDPOINTS.AVAILABLE}enrolled/`;
-			const params = new URLSearchParams();
-
-			if (page && page > 1) {
-				params.append("page", page.toString());
-			}
-
-			if (params.toString()) {
-				url += `?${params.toString()}`;
-			}
+			// Enrolled courses are cursor paginated, pages are reached through next/previous links
+			const url = pageUrl || `${WORKSHOP_ENDPOINTS.AVAILABLE}enrolled/`;
 
 			const response = await fetch(url, {
 				headers: {